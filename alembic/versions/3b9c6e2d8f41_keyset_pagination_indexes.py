@@ -0,0 +1,52 @@
+"""keyset pagination indexes
+
+Revision ID: 3b9c6e2d8f41
+Revises: 7d2e4f1a9c3b
+Create Date: 2026-10-18 14:03:27.518806
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9c6e2d8f41'
+down_revision: Union[str, Sequence[str], None] = '7d2e4f1a9c3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Built CONCURRENTLY so the three busiest tables keep taking writes; see e41a7c5d2b90 for why
+# the statements run outside the migration transaction and carry if_not_exists/if_exists.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_wishlists_user_id_created_at_id',
+            'wishlists',
+            ['user_id', 'created_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_items_wishlist_id_position_id',
+            'items',
+            ['wishlist_id', 'position', 'id'],
+            postgresql_where=sa.text('is_deleted IS false'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_reservations_item_id_created_at_id',
+            'reservations',
+            ['item_id', 'created_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_reservations_item_id_created_at_id', table_name='reservations', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_items_wishlist_id_position_id', table_name='items', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_wishlists_user_id_created_at_id', table_name='wishlists', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,41 @@
+"""item reservation aggregates
+
+Revision ID: 7d2e4f1a9c3b
+Revises: ca5be3b8b133
+Create Date: 2026-10-18 10:12:44.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e4f1a9c3b'
+down_revision: Union[str, Sequence[str], None] = 'ca5be3b8b133'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('items', sa.Column('reserved_amount', sa.Numeric(10, 2), server_default='0', nullable=False))
+    op.add_column('items', sa.Column('reservation_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        """
+        UPDATE items
+        SET reserved_amount = agg.reserved_amount,
+            reservation_count = agg.reservation_count
+        FROM (
+            SELECT item_id, SUM(amount) AS reserved_amount, COUNT(*) AS reservation_count
+            FROM reservations
+            GROUP BY item_id
+        ) AS agg
+        WHERE items.id = agg.item_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('items', 'reservation_count')
+    op.drop_column('items', 'reserved_amount')
@@ -0,0 +1,42 @@
+"""hot query indexes
+
+Revision ID: e41a7c5d2b90
+Revises: 3b9c6e2d8f41
+Create Date: 2026-10-18 16:41:09.302114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41a7c5d2b90'
+down_revision: Union[str, Sequence[str], None] = '3b9c6e2d8f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction, and a failed concurrent
+# build leaves an INVALID index behind, hence the if_not_exists/if_exists guards on retry.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Reservations of a user, and the ON DELETE SET NULL lookup when a user is removed
+        op.create_index(
+            'ix_reservations_user_id',
+            'reservations',
+            ['user_id'],
+            postgresql_where=sa.text('user_id IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Covered by the leading column of the keyset indexes from 3b9c6e2d8f41
+        op.drop_index('ix_reservations_item_id', table_name='reservations', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_wishlists_user_id', table_name='wishlists', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_wishlists_user_id', 'wishlists', ['user_id'], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_reservations_item_id', 'reservations', ['item_id'], postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_reservations_user_id', table_name='reservations', postgresql_concurrently=True, if_exists=True)
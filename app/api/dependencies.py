@@ -2,32 +2,63 @@ import uuid
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_token
-from app.db.session import get_db
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import CurrentUser, decode_access_token
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 
 security_scheme = HTTPBearer(auto_error=False)
 
+user_identity_cache = TTLCache(
+    maxsize=settings.AUTH_IDENTITY_CACHE_SIZE,
+    ttl=settings.AUTH_IDENTITY_CACHE_TTL_SECONDS,
+)
 
-async def get_current_user(
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_identity(mapper, connection, target: User) -> None:
+    user_identity_cache.invalidate(target.id)
+
+
+async def _load_identity(db: AsyncSession, user_id: uuid.UUID) -> CurrentUser | None:
+    identity = user_identity_cache.get(user_id)
+    if identity is None:
+        result = await db.execute(select(User.id, User.email).where(User.id == user_id))
+        row = result.one_or_none()
+        if row is None:
+            return None
+        identity = CurrentUser(id=row.id, email=row.email)
+        user_identity_cache.set(user_id, identity)
+    return identity
+
+
+async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials | None = Depends(security_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+) -> uuid.UUID:
+    """Token-only authentication for handlers that scope their queries by user id.
+
+    Never touches the database. A token of a deleted user owns nothing, so reads and updates
+    scoped by its id find nothing (404); inserts of rows owned by it hit the foreign key, which
+    the services turn into 401.
+    """
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
-    payload = decode_token(credentials.credentials)
-    if payload is None or payload.get("type") != "access":
+    user_id = decode_access_token(credentials.credentials)
+    if user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return user_id
 
-    try:
-        user_id = uuid.UUID(payload["sub"])
-    except (KeyError, ValueError):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+async def get_current_user(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> User:
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None:
@@ -38,18 +69,12 @@ async def get_current_user(
 async def get_current_user_optional(
     credentials: HTTPAuthorizationCredentials | None = Depends(security_scheme),
     db: AsyncSession = Depends(get_db),
-) -> User | None:
+) -> CurrentUser | None:
     if credentials is None:
         return None
 
-    payload = decode_token(credentials.credentials)
-    if payload is None or payload.get("type") != "access":
+    user_id = decode_access_token(credentials.credentials)
+    if user_id is None:
         return None
 
-    try:
-        user_id = uuid.UUID(payload["sub"])
-    except (KeyError, ValueError):
-        return None
-
-    result = await db.execute(select(User).where(User.id == user_id))
-    return result.scalar_one_or_none()
+    return await _load_identity(db, user_id)
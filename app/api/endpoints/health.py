@@ -1,8 +1,40 @@
 from fastapi import APIRouter
 
+from app.api.dependencies import user_identity_cache
+from app.core.cache import public_wishlist_cache
+from app.core.security import access_claims_cache, password_hashing_stats
+from app.core.websocket import dispatcher
+from app.db.database import replica_router
+from app.services.scraper_service import autofill_cache
+
 router = APIRouter()
 
 
 @router.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@router.get("/health/cache")
+async def cache_stats():
+    return {
+        "public_wishlist": public_wishlist_cache.stats(),
+        "access_claims": access_claims_cache.stats(),
+        "user_identity": user_identity_cache.stats(),
+        "autofill": autofill_cache.stats(),
+    }
+
+
+@router.get("/health/password-hashing")
+async def password_hashing():
+    return password_hashing_stats()
+
+
+@router.get("/health/realtime")
+async def realtime_stats():
+    return dispatcher.stats()
+
+
+@router.get("/health/database")
+async def database_stats():
+    return replica_router.stats()
@@ -1,13 +1,22 @@
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user_id
 from app.db.session import get_db
-from app.models.user import User
-from app.schemas.item import AutofillRequest, AutofillResponse, ItemCreate, ItemResponse, ItemUpdate
+from app.schemas.item import (
+    AutofillRequest,
+    AutofillResponse,
+    ItemCreate,
+    ItemImportResponse,
+    ItemMove,
+    ItemReorder,
+    ItemResponse,
+    ItemUpdate,
+)
 from app.services import item_service
+from app.services.item_import import iter_csv_rows, iter_json_rows
 from app.services.scraper_service import scrape_url
 
 router = APIRouter(tags=["items"])
@@ -17,31 +26,84 @@ router = APIRouter(tags=["items"])
 async def create_item(
     wishlist_id: uuid.UUID,
     data: ItemCreate,
-    user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    return await item_service.create_item(db, wishlist_id, user.id, data)
+    return await item_service.create_item(db, wishlist_id, user_id, data)
+
+
+@router.post(
+    "/wishlists/{wishlist_id}/items/import",
+    response_model=ItemImportResponse,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": ItemCreate.model_json_schema()}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_items(
+    wishlist_id: uuid.UUID,
+    request: Request,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        rows = iter_csv_rows(request.stream())
+    elif content_type in ("application/json", ""):
+        rows = iter_json_rows(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send a JSON array or text/csv",
+        )
+    return await item_service.import_items(db, wishlist_id, user_id, rows)
+
+
+@router.put("/wishlists/{wishlist_id}/items/order", status_code=204)
+async def reorder_items(
+    wishlist_id: uuid.UUID,
+    data: ItemReorder,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    await item_service.reorder_items(db, wishlist_id, user_id, data.item_ids)
+
+
+@router.put("/items/{item_id}/position", response_model=ItemResponse)
+async def move_item(
+    item_id: uuid.UUID,
+    data: ItemMove,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    return await item_service.move_item(db, item_id, user_id, data.after_id)
 
 
 @router.put("/items/{item_id}", response_model=ItemResponse)
 async def update_item(
     item_id: uuid.UUID,
     data: ItemUpdate,
-    user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    return await item_service.update_item(db, item_id, user.id, data)
+    return await item_service.update_item(db, item_id, user_id, data)
 
 
 @router.delete("/items/{item_id}", status_code=204)
 async def delete_item(
     item_id: uuid.UUID,
-    user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    await item_service.delete_item(db, item_id, user.id)
+    await item_service.delete_item(db, item_id, user_id)
 
 
 @router.post("/items/autofill", response_model=AutofillResponse)
 async def autofill_item(data: AutofillRequest):
-    return scrape_url(data.url)
+    return await scrape_url(data.url)
@@ -1,13 +1,16 @@
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user_optional
-from app.db.session import get_db
-from app.models.user import User
+from app.core.pagination import PageParams
+from app.core.security import CurrentUser
+from app.core.websocket import dispatcher
+from app.db.session import get_db, get_read_db
 from app.schemas.reservation import (
     ReservationAnonymousResponse,
+    ReservationBatchCreate,
     ReservationCreate,
     ReservationResponse,
     ReservationUpdate,
@@ -21,83 +24,77 @@ router = APIRouter(tags=["reservations"])
 async def reserve_item(
     item_id: uuid.UUID,
     data: ReservationCreate,
-    user: User | None = Depends(get_current_user_optional),
+    user: CurrentUser | None = Depends(get_current_user_optional),
     db: AsyncSession = Depends(get_db),
 ):
-    reservation = await reservation_service.create_reservation(db, item_id, data, user)
+    result = await reservation_service.create_reservation(db, item_id, data, user)
+    _publish(result, "item:reserved")
+    return result.reservation
 
-    # Emit socket event
-    from app.core.websocket import sio
-    from sqlalchemy import select
-    from app.models.item import Item
-    from sqlalchemy.orm import selectinload
 
-    result = await db.execute(
-        select(Item).options(selectinload(Item.wishlist)).where(Item.id == item_id)
+@router.post("/w/{slug}/reserve", response_model=list[ReservationResponse], status_code=201)
+async def reserve_items(
+    slug: str,
+    data: ReservationBatchCreate,
+    user: CurrentUser | None = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_db),
+):
+    results = await reservation_service.create_reservations_batch(db, slug, data, user)
+    dispatcher.publish(
+        f"wishlist:{slug}",
+        "items:reserved",
+        {"reservations": [_event_payload(result) for result in results]},
     )
-    item = result.scalar_one_or_none()
-    if item:
-        await sio.emit(
-            "item:reserved",
-            {"item_id": str(item_id), "reservation_id": str(reservation.id)},
-            room=f"wishlist:{item.wishlist.slug}",
-        )
-
-    return reservation
+    return [result.reservation for result in results]
 
 
 @router.put("/reservations/{reservation_id}", response_model=ReservationResponse)
 async def update_reservation(
     reservation_id: uuid.UUID,
     data: ReservationUpdate,
-    user: User | None = Depends(get_current_user_optional),
+    user: CurrentUser | None = Depends(get_current_user_optional),
     db: AsyncSession = Depends(get_db),
 ):
-    return await reservation_service.update_reservation(db, reservation_id, data, user)
+    result = await reservation_service.update_reservation(db, reservation_id, data, user)
+    return result.reservation
 
 
 @router.delete("/reservations/{reservation_id}", status_code=204)
 async def delete_reservation(
     reservation_id: uuid.UUID,
-    user: User | None = Depends(get_current_user_optional),
+    user: CurrentUser | None = Depends(get_current_user_optional),
     db: AsyncSession = Depends(get_db),
 ):
-    # Get item info before deletion for socket event
-    from sqlalchemy import select
-    from app.models.reservation import Reservation
-    from app.models.item import Item
-    from sqlalchemy.orm import selectinload
-
-    result = await db.execute(
-        select(Reservation).where(Reservation.id == reservation_id)
-    )
-    res = result.scalar_one_or_none()
-    item_id = res.item_id if res else None
-
-    await reservation_service.delete_reservation(db, reservation_id, user)
-
-    if item_id:
-        from app.core.websocket import sio
-
-        result = await db.execute(
-            select(Item).options(selectinload(Item.wishlist)).where(Item.id == item_id)
-        )
-        item = result.scalar_one_or_none()
-        if item:
-            await sio.emit(
-                "item:unreserved",
-                {"item_id": str(item_id), "reservation_id": str(reservation_id)},
-                room=f"wishlist:{item.wishlist.slug}",
-            )
+    result = await reservation_service.delete_reservation(db, reservation_id, user)
+    _publish(result, "item:unreserved")
 
 
 @router.get("/items/{item_id}/reservations")
 async def list_reservations(
     item_id: uuid.UUID,
-    user: User | None = Depends(get_current_user_optional),
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(),
+    user: CurrentUser | None = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    reservations, is_owner = await reservation_service.get_item_reservations(db, item_id, user)
+    reservations, is_owner = await reservation_service.get_item_reservations(
+        db, item_id, user, page
+    )
+    if page.enabled:
+        reservations = page.finish(reservations, response, lambda r: (r.created_at, r.id))
     if is_owner:
         return [ReservationAnonymousResponse.model_validate(r) for r in reservations]
     return [ReservationResponse.model_validate(r) for r in reservations]
+
+
+def _event_payload(result: reservation_service.ReservationResult) -> dict:
+    return {
+        "item_id": str(result.item_id),
+        "reservation_id": str(result.reservation.id),
+        "reserved_amount": float(result.reserved_amount),
+        "reservation_count": result.reservation_count,
+    }
+
+
+def _publish(result: reservation_service.ReservationResult, event: str) -> None:
+    dispatcher.publish(f"wishlist:{result.wishlist_slug}", event, _event_payload(result))
@@ -1,136 +1,206 @@
 import uuid
-from decimal import Decimal
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
-from app.db.session import get_db
-from app.models.user import User
+from app.api.dependencies import get_current_user_id
+from app.core.cache import (
+    CachedResponse,
+    etag_matches,
+    make_etag,
+    public_wishlist_cache,
+    start_public_wishlist_fill,
+    store_public_wishlist,
+)
+from app.core.pagination import PageParams
+from app.core.serialization import dumps_json_line, encode, negotiate, render
+from app.db.session import get_db, get_read_db
 from app.schemas.wishlist import (
-    ItemInWishlist,
     WishlistCreate,
     WishlistListResponse,
     WishlistResponse,
     WishlistUpdate,
     WishlistWithItemsResponse,
 )
-from app.services import wishlist_service
+from app.services import wishlist_service, wishlist_views
+from app.services.wishlist_views import ItemView, WishlistView
 
 router = APIRouter(tags=["wishlists"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+_NDJSON_RESPONSES = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {}},
+        "description": "With `Accept: application/x-ndjson`: the wishlist line, then one line per item.",
+    }
+}
+
 
 @router.get("/wishlists", response_model=list[WishlistListResponse])
 async def list_wishlists(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(),
+    accept: str | None = Header(None),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    wishlists = await wishlist_service.get_user_wishlists(db, user.id)
-    return [_build_wishlist_list_response(w) for w in wishlists]
+    rows = await wishlist_service.get_user_wishlists(db, user_id, page)
+    if page.enabled:
+        rows = page.finish(rows, response, lambda row: (row[0].created_at, row[0].id))
+    content = [
+        _wishlist_list_record(wishlist, items_count, reserved_count)
+        for wishlist, items_count, reserved_count in rows
+    ]
+    return render(content, accept, response.headers)
 
 
 @router.post("/wishlists", response_model=WishlistResponse, status_code=201)
 async def create_wishlist(
     data: WishlistCreate,
-    user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    return await wishlist_service.create_wishlist(db, user.id, data)
+    return await wishlist_service.create_wishlist(db, user_id, data)
 
 
-@router.get("/wishlists/{wishlist_id}", response_model=WishlistWithItemsResponse)
+@router.get(
+    "/wishlists/{wishlist_id}",
+    response_model=WishlistWithItemsResponse,
+    responses=_NDJSON_RESPONSES,
+)
 async def get_wishlist(
     wishlist_id: uuid.UUID,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(),
+    accept: str | None = Header(None),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    wishlist = await wishlist_service.get_wishlist(db, wishlist_id, user.id)
-    return _build_wishlist_response(wishlist, is_owner=True)
+    wishlist = await wishlist_views.get_owner_wishlist(db, wishlist_id, user_id)
+    if _wants_ndjson(accept):
+        return _stream_wishlist(db, wishlist)
+    items = await _get_items(db, wishlist, page, response)
+    return render(_wishlist_record(wishlist, items), accept, response.headers)
 
 
 @router.put("/wishlists/{wishlist_id}", response_model=WishlistResponse)
 async def update_wishlist(
     wishlist_id: uuid.UUID,
     data: WishlistUpdate,
-    user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    return await wishlist_service.update_wishlist(db, wishlist_id, user.id, data)
+    return await wishlist_service.update_wishlist(db, wishlist_id, user_id, data)
 
 
 @router.delete("/wishlists/{wishlist_id}", status_code=204)
 async def delete_wishlist(
     wishlist_id: uuid.UUID,
-    user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    await wishlist_service.delete_wishlist(db, wishlist_id, user.id)
-
-
-@router.get("/w/{slug}", response_model=WishlistWithItemsResponse)
-async def get_public_wishlist(slug: str, db: AsyncSession = Depends(get_db)):
-    wishlist = await wishlist_service.get_wishlist_by_slug(db, slug)
-    return _build_wishlist_response(wishlist, is_owner=False)
-
-
-def _build_wishlist_response(wishlist, *, is_owner: bool) -> WishlistWithItemsResponse:
-    items = []
-    for item in wishlist.items:
-        if item.is_deleted:
-            continue
-        reserved_amount = float(sum(r.amount for r in item.reservations))
-        is_fully_reserved = reserved_amount >= float(item.price)
-        items.append(
-            ItemInWishlist(
-                id=item.id,
-                title=item.title,
-                description=item.description,
-                url=item.url,
-                price=float(item.price),
-                currency=item.currency,
-                image_url=item.image_url,
-                position=item.position,
-                reserved_amount=reserved_amount,
-                is_fully_reserved=is_fully_reserved,
-                reservation_count=len(item.reservations),
-            )
-        )
-    items.sort(key=lambda i: i.position)
-
-    return WishlistWithItemsResponse(
-        id=wishlist.id,
-        user_id=wishlist.user_id,
-        title=wishlist.title,
-        description=wishlist.description,
-        slug=wishlist.slug,
-        is_public=wishlist.is_public,
-        event_date=wishlist.event_date,
-        created_at=wishlist.created_at,
-        updated_at=wishlist.updated_at,
-        items=items,
-    )
-
-
-def _build_wishlist_list_response(wishlist) -> WishlistListResponse:
-    items_count = 0
-    reserved_count = 0
-    for item in wishlist.items:
-        if item.is_deleted:
-            continue
-        items_count += 1
-        if item.reservations:
-            reserved_count += 1
-
-    return WishlistListResponse(
-        id=wishlist.id,
-        user_id=wishlist.user_id,
-        title=wishlist.title,
-        description=wishlist.description,
-        slug=wishlist.slug,
-        is_public=wishlist.is_public,
-        event_date=wishlist.event_date,
-        created_at=wishlist.created_at,
-        updated_at=wishlist.updated_at,
-        items_count=items_count,
-        reserved_count=reserved_count,
-    )
+    await wishlist_service.delete_wishlist(db, wishlist_id, user_id)
+
+
+@router.get("/w/{slug}", response_model=WishlistWithItemsResponse, responses=_NDJSON_RESPONSES)
+async def get_public_wishlist(
+    slug: str,
+    response: Response,
+    page: PageParams = Depends(),
+    accept: str | None = Header(None),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if _wants_ndjson(accept):
+        wishlist = await wishlist_views.get_public_wishlist(db, slug)
+        return _stream_wishlist(db, wishlist)
+    if page.enabled:
+        # Pages are not cached: the cache holds the full document per slug
+        wishlist = await wishlist_views.get_public_wishlist(db, slug)
+        items = await _get_items(db, wishlist, page, response)
+        return render(_wishlist_record(wishlist, items), accept, response.headers)
+
+    media_type = negotiate(accept)
+    entries = public_wishlist_cache.get(slug)
+    cached = entries.get(media_type) if entries else None
+    if cached is None:
+        # An invalidation while the queries are awaited makes this body stale; it is then
+        # still served to this request but not cached
+        fill = start_public_wishlist_fill()
+        wishlist = await wishlist_views.get_public_wishlist(db, slug)
+        items = await wishlist_views.get_items(db, wishlist.id)
+        body = encode(_wishlist_record(wishlist, items), media_type)
+        cached = CachedResponse(body=body, etag=make_etag(body), media_type=media_type)
+        store_public_wishlist(slug, fill, cached)
+
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+
+
+def _wants_ndjson(accept: str | None) -> bool:
+    return accept is not None and NDJSON_MEDIA_TYPE in accept
+
+
+def _stream_wishlist(db: AsyncSession, wishlist: WishlistView) -> StreamingResponse:
+    return StreamingResponse(_ndjson_lines(db, wishlist), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def _ndjson_lines(db: AsyncSession, wishlist: WishlistView) -> AsyncIterator[bytes]:
+    yield dumps_json_line(_wishlist_fields(wishlist))
+    async for items in wishlist_views.stream_items(db, wishlist.id):
+        yield b"".join(dumps_json_line(_item_record(item)) for item in items)
+
+
+async def _get_items(
+    db: AsyncSession, wishlist: WishlistView, page: PageParams, response: Response
+) -> list[ItemView]:
+    items = await wishlist_views.get_items(db, wishlist.id, page)
+    if page.enabled:
+        items = page.finish(items, response, lambda item: (item.position, item.id))
+    return items
+
+
+def _wishlist_fields(wishlist) -> dict:
+    return {
+        "id": wishlist.id,
+        "user_id": wishlist.user_id,
+        "title": wishlist.title,
+        "description": wishlist.description,
+        "slug": wishlist.slug,
+        "is_public": wishlist.is_public,
+        "event_date": wishlist.event_date,
+        "created_at": wishlist.created_at,
+        "updated_at": wishlist.updated_at,
+    }
+
+
+def _wishlist_record(wishlist: WishlistView, items: list[ItemView]) -> dict:
+    """WishlistWithItemsResponse as a plain dict."""
+    return {**_wishlist_fields(wishlist), "items": [_item_record(item) for item in items]}
+
+
+def _item_record(item: ItemView) -> dict:
+    """ItemInWishlist as a plain dict."""
+    price = float(item.price)
+    reserved_amount = float(item.reserved_amount)
+    return {
+        "id": item.id,
+        "title": item.title,
+        "description": item.description,
+        "url": item.url,
+        "price": price,
+        "currency": item.currency,
+        "image_url": item.image_url,
+        "position": item.position,
+        "reserved_amount": reserved_amount,
+        "is_fully_reserved": reserved_amount >= price,
+        "reservation_count": item.reservation_count,
+    }
+
+
+def _wishlist_list_record(wishlist, items_count: int, reserved_count: int) -> dict:
+    return {**_wishlist_fields(wishlist), "items_count": items_count, "reserved_count": reserved_count}
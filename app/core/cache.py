@@ -0,0 +1,148 @@
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, NamedTuple
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """Bounded in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+# Serialized GET /w/{slug} responses, keyed by slug; each value maps media type -> CachedResponse
+public_wishlist_cache = TTLCache(
+    maxsize=settings.PUBLIC_WISHLIST_CACHE_SIZE,
+    ttl=settings.PUBLIC_WISHLIST_CACHE_TTL_SECONDS,
+)
+
+# Slugs written in the last READ_YOUR_WRITES_SECONDS: their reads skip the replicas, so a
+# cache miss right after an invalidation is not refilled from a lagging replica
+recent_wishlist_writes = TTLCache(
+    maxsize=settings.READ_YOUR_WRITES_CACHE_SIZE,
+    ttl=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+# Invalidations of the last _FILL_TIMEOUT_SECONDS, slug -> (sequence number, time), oldest
+# first. A response is cached only if its slug was not invalidated after the fill started and the
+# fill took less than _FILL_TIMEOUT_SECONDS, so older entries are dropped without a fill missing them.
+_FILL_TIMEOUT_SECONDS = 60.0
+_invalidation_sequence = 0
+_recent_invalidations: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+# Called with every slug invalidated in this process; app.core.websocket registers one that
+# forwards the slug to the other worker processes
+invalidation_listeners: list[Callable[[str], None]] = []
+
+
+class CacheFill(NamedTuple):
+    sequence: int
+    started_at: float
+
+
+def start_public_wishlist_fill() -> CacheFill:
+    """Taken before the queries of a cache miss, then passed to store_public_wishlist."""
+    return CacheFill(_invalidation_sequence, time.monotonic())
+
+
+def store_public_wishlist(slug: str, fill: CacheFill, cached: CachedResponse) -> bool:
+    """Caches cached for slug unless the slug was invalidated since the fill started."""
+    if time.monotonic() - fill.started_at >= _FILL_TIMEOUT_SECONDS:
+        return False
+    invalidated = _recent_invalidations.get(slug)
+    if invalidated is not None and invalidated[0] > fill.sequence:
+        return False
+    entries = public_wishlist_cache.get(slug) or {}
+    public_wishlist_cache.set(slug, {**entries, cached.media_type: cached})
+    return True
+
+
+def invalidate_public_wishlist(slug: str, broadcast: bool = True) -> None:
+    """Drops the cached slug; with broadcast, the other workers are told to drop it too."""
+    global _invalidation_sequence
+    _invalidation_sequence += 1
+    now = time.monotonic()
+    _recent_invalidations[slug] = (_invalidation_sequence, now)
+    _recent_invalidations.move_to_end(slug)
+    while next(iter(_recent_invalidations.values()))[1] <= now - _FILL_TIMEOUT_SECONDS:
+        _recent_invalidations.popitem(last=False)
+    public_wishlist_cache.invalidate(slug)
+    recent_wishlist_writes.set(slug, True)
+    if broadcast:
+        for listener in invalidation_listeners:
+            listener(slug)
@@ -0,0 +1,70 @@
+import codecs
+from collections.abc import AsyncIterator
+
+import aiohttp
+
+from app.core.config import settings
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+_session: aiohttp.ClientSession | None = None
+
+
+class FetchError(Exception):
+    pass
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Shared pooled client; connections are kept alive and reused across requests."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=settings.HTTP_MAX_CONNECTIONS,
+                limit_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=300,
+            ),
+            timeout=aiohttp.ClientTimeout(
+                total=settings.HTTP_TOTAL_TIMEOUT,
+                sock_connect=settings.HTTP_CONNECT_TIMEOUT,
+                sock_read=settings.HTTP_READ_TIMEOUT,
+            ),
+            headers={"User-Agent": USER_AGENT},
+        )
+    return _session
+
+
+async def close_http_session() -> None:
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+async def stream_text(url: str, *, max_bytes: int | None = None) -> AsyncIterator[str]:
+    """Yields the decoded body of url chunk by chunk, stopping after max_bytes.
+
+    Wrap in contextlib.aclosing() and break out early to release the
+    connection without reading the rest of the response.
+    """
+    remaining = max_bytes or settings.HTTP_MAX_BODY_BYTES
+    try:
+        async with get_http_session().get(url) as resp:
+            resp.raise_for_status()
+            decoder = _incremental_decoder(resp.charset)
+            async for chunk in resp.content.iter_chunked(settings.HTTP_CHUNK_SIZE):
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+                yield decoder.decode(chunk)
+                if remaining <= 0:
+                    break
+            yield decoder.decode(b"", final=True)
+    except (aiohttp.ClientError, TimeoutError, ValueError) as exc:
+        raise FetchError(str(exc)) from exc
+
+
+def _incremental_decoder(charset: str | None) -> codecs.IncrementalDecoder:
+    try:
+        return codecs.getincrementaldecoder(charset or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
@@ -0,0 +1,222 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.security import password_hashing_stats
+from app.core.websocket import sio
+from app.db.query_log import fingerprint, warn_repeated
+
+_COUNT_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16, 25, 50, 100)
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests by route and status", ["method", "route", "status"]
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"]
+)
+db_queries_per_request = Histogram(
+    "http_request_db_queries", "SQL statements per HTTP request", ["route"], buckets=_COUNT_BUCKETS
+)
+db_time_per_request = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per HTTP request", ["route"]
+)
+scraper_fetch_duration = Histogram(
+    "scraper_fetch_duration_seconds", "Autofill page fetch and extraction", ["outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15),
+)
+
+
+class _QueryStats:
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        # Only kept when something reads them: the query log or a query budget
+        self.statements: list[str] | None = [] if keep_statements else None
+
+    def add(self, other: "_QueryStats") -> None:
+        self.count += other.count
+        self.seconds += other.seconds
+        if self.statements is not None and other.statements is not None:
+            self.statements.extend(other.statements)
+
+
+_request_queries: ContextVar[_QueryStats | None] = ContextVar("request_queries", default=None)
+
+
+@contextmanager
+def count_queries(keep_statements: bool = False) -> Iterator[_QueryStats]:
+    """Counts the statements run in this context; they count towards any enclosing one too."""
+    outer = _request_queries.get()
+    stats = _QueryStats(keep_statements or (outer is not None and outer.statements is not None))
+    token = _request_queries.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_queries.reset(token)
+        if outer is not None:
+            outer.add(stats)
+
+
+@contextmanager
+def assert_max_queries(limit: int, label: str = "block") -> Iterator[_QueryStats]:
+    """Fails when the block runs more than limit statements; for tests and budget checks."""
+    with count_queries(keep_statements=True) as stats:
+        yield stats
+    warn_repeated(stats.statements, settings.QUERY_LOG_REPEAT_THRESHOLD, label)
+    if stats.count > limit:
+        listing = "\n".join(f"  {fingerprint(statement)}" for statement in stats.statements)
+        raise AssertionError(
+            f"{label} ran {stats.count} statements, expected at most {limit}:\n{listing}"
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_queries.get() is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_queries.get()
+    started = getattr(context, "_metrics_started", None)
+    if stats is not None and started is not None:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - started
+        if stats.statements is not None:
+            stats.statements.append(statement)
+
+
+_engines: list[tuple[str, AsyncEngine]] = []
+
+
+def instrument_engine(engine: AsyncEngine, role: str) -> None:
+    """Counts the engine's statements into the current request and exposes its pool."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    _engines.append((role, engine))
+
+
+class _RuntimeCollector:
+    """Gauges read at scrape time, so nothing is tracked on the request path."""
+
+    def collect(self):
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out", "Connections in use", labels=["engine"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow", "Connections opened beyond pool_size", labels=["engine"]
+        )
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["engine"])
+        for role, engine in _engines:
+            pool = engine.pool
+            if hasattr(pool, "checkedout"):
+                checked_out.add_metric([role], pool.checkedout())
+                overflow.add_metric([role], max(pool.overflow(), 0))
+                size.add_metric([role], pool.size())
+        yield checked_out
+        yield overflow
+        yield size
+
+        hashing = password_hashing_stats()
+        yield GaugeMetricFamily(
+            "password_hash_in_flight", "bcrypt hashes and checks running or waiting for a worker",
+            value=hashing["in_flight"],
+        )
+        yield GaugeMetricFamily(
+            "password_hash_queue_depth", "bcrypt hashes and checks waiting for a worker",
+            value=hashing["queue_depth"],
+        )
+        yield GaugeMetricFamily(
+            "password_hash_workers", "bcrypt worker threads", value=hashing["workers"]
+        )
+
+        # Every sid sits in the None room and in a room named after itself
+        rooms = sio.manager.rooms.get("/", {})
+        clients = rooms.get(None, {})
+        yield GaugeMetricFamily(
+            "socketio_connected_clients", "Socket.IO clients connected to this process",
+            value=len(clients),
+        )
+        yield GaugeMetricFamily(
+            "socketio_rooms", "Socket.IO rooms with members in this process",
+            value=sum(1 for room in rooms if room is not None and room not in clients),
+        )
+
+
+REGISTRY.register(_RuntimeCollector())
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Whatever no API route matched falls through to the Socket.IO mount
+    return "/socket.io" if scope["path"].startswith("/socket.io") else "unmatched"
+
+
+class MetricsMiddleware:
+    """Records latency, status and SQL statements of every HTTP request by route template.
+
+    With QUERY_LOG_ENABLED every response also carries X-Query-Count, and statements repeated
+    QUERY_LOG_REPEAT_THRESHOLD times in one request are logged as probable N+1s.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.query_log = settings.QUERY_LOG_ENABLED
+        # labels() takes a lock and hashes the label values; children are looked up once
+        self._children: dict[tuple[str, str], tuple] = {}
+        self._counters: dict[tuple[str, str, int], Counter] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.query_log:
+                    headers = [*message.get("headers", ())]
+                    headers.append((b"x-query-count", str(stats.count).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        started = time.perf_counter()
+        with count_queries(self.query_log) as stats:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                elapsed = time.perf_counter() - started
+                self._observe(scope, status, elapsed, stats)
+
+    def _observe(self, scope, status: int, elapsed: float, stats: _QueryStats) -> None:
+        key = (scope["method"], _route_label(scope))
+        if self.query_log:
+            warn_repeated(stats.statements, settings.QUERY_LOG_REPEAT_THRESHOLD, " ".join(key))
+        children = self._children.get(key)
+        if children is None:
+            children = self._children[key] = (
+                http_request_duration.labels(*key),
+                db_queries_per_request.labels(key[1]),
+                db_time_per_request.labels(key[1]),
+            )
+        duration, queries, db_time = children
+        duration.observe(elapsed)
+        queries.observe(stats.count)
+        db_time.observe(stats.seconds)
+        counter = self._counters.get((*key, status))
+        if counter is None:
+            counter = self._counters[(*key, status)] = http_requests.labels(*key, str(status))
+        counter.inc()
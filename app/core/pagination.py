@@ -0,0 +1,68 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException, Query, Response, status
+
+from app.core.config import settings
+
+
+class PageParams:
+    """Opt-in keyset pagination: without `limit` and `cursor` the full list is returned."""
+
+    def __init__(
+        self,
+        limit: int | None = Query(None, ge=1, le=settings.PAGE_SIZE_MAX),
+        cursor: str | None = Query(None),
+    ):
+        self.enabled = limit is not None or cursor is not None
+        self.limit = limit or settings.PAGE_SIZE_DEFAULT
+        self.cursor = cursor
+
+    def after(self, *types: type) -> tuple | None:
+        """Keyset position decoded from the cursor, or None for the first page."""
+        return decode_cursor(self.cursor, *types) if self.cursor else None
+
+    def finish(self, rows: list, response: Response, key) -> list:
+        """Trims the extra lookahead row and sets X-Next-Cursor when there is a next page.
+
+        Queries fetch `limit + 1` rows; `key(row)` gives the values the cursor is built from.
+        """
+        if len(rows) > self.limit:
+            rows = rows[: self.limit]
+            response.headers["X-Next-Cursor"] = encode_cursor(*key(rows[-1]))
+        return rows
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps([_dump(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """Decodes a cursor made by encode_cursor into values of the given types."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+        return tuple(_load(t, v) for t, v in zip(types, values))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _dump(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _load(type_: type, value):
+    if type_ is datetime:
+        return datetime.fromisoformat(value)
+    if type_ is int and not isinstance(value, int):
+        raise TypeError(value)
+    return type_(value)
@@ -1,19 +1,81 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
 
 import bcrypt
 from jose import JWTError, jwt
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 
+class CurrentUser(NamedTuple):
+    """Minimal identity of an authenticated user, cheap to cache and pass around."""
+    id: uuid.UUID
+    email: str
+
+
+# Subject of verified access tokens, keyed by token hash and kept until the token's exp
+access_claims_cache = TTLCache(
+    maxsize=settings.AUTH_CLAIMS_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+# bcrypt releases the GIL, so a small pool keeps hashing off the event loop
+# while capping how many cores a login burst can take
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+_password_tasks_in_flight = 0
+
+
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=12)).decode()
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode()
 
 
 def verify_password(password: str, password_hash: str) -> bool:
     return bcrypt.checkpw(password.encode(), password_hash.encode())
 
 
+def password_needs_rehash(password_hash: str) -> bool:
+    try:
+        rounds = int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+async def _run_password_task(fn: Callable, *args):
+    global _password_tasks_in_flight
+    _password_tasks_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, fn, *args)
+    finally:
+        _password_tasks_in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_task(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await _run_password_task(verify_password, password, password_hash)
+
+
+def password_hashing_stats() -> dict:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "in_flight": _password_tasks_in_flight,
+        "queue_depth": max(0, _password_tasks_in_flight - settings.PASSWORD_HASH_WORKERS),
+    }
+
+
 def create_access_token(subject: str) -> str:
     expire = datetime.now(UTC) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return jwt.encode(
@@ -38,3 +100,24 @@ def decode_token(token: str) -> dict | None:
         return payload
     except JWTError:
         return None
+
+
+def decode_access_token(token: str) -> uuid.UUID | None:
+    """Returns the user id of a valid access token, skipping JWT verification on cache hits."""
+    key = hashlib.sha256(token.encode()).digest()
+    user_id = access_claims_cache.get(key)
+    if user_id is not None:
+        return user_id
+
+    payload = decode_token(token)
+    if payload is None or payload.get("type") != "access":
+        return None
+    try:
+        user_id = uuid.UUID(payload["sub"])
+        ttl = float(payload["exp"]) - time.time()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if ttl > 0:
+        access_claims_cache.set(key, user_id, ttl=min(ttl, access_claims_cache.ttl))
+    return user_id
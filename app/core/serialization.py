@@ -0,0 +1,64 @@
+"""Response encoding that goes from plain dicts to bytes in one pass.
+
+Handlers that return `render(...)` skip FastAPI's response_model validation; their
+`response_model` only documents the shape. JSON is the default, MessagePack is used
+when the client asks for it in `Accept`.
+"""
+import uuid
+from datetime import date
+
+import msgpack
+import orjson
+from fastapi import Response
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ACCEPT = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# Same datetime format as pydantic ("...Z" for UTC)
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def negotiate(accept: str | None) -> str:
+    if accept and any(media_type in accept for media_type in _MSGPACK_ACCEPT):
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def _json_default(value):
+    # asyncpg returns its own uuid.UUID subclass, which orjson does not serialize natively
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} as JSON")
+
+
+def dumps_json(content) -> bytes:
+    return orjson.dumps(content, default=_json_default, option=_ORJSON_OPTIONS)
+
+
+def dumps_json_line(content) -> bytes:
+    return orjson.dumps(
+        content, default=_json_default, option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+    )
+
+
+def _msgpack_default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def encode(content, media_type: str) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        # Aware datetimes become the MessagePack timestamp extension type
+        return msgpack.packb(content, default=_msgpack_default, datetime=True)
+    return dumps_json(content)
+
+
+def render(content, accept: str | None, headers=None) -> Response:
+    media_type = negotiate(accept)
+    response = Response(encode(content, media_type), media_type=media_type, headers=headers)
+    response.headers["Vary"] = "Accept"
+    return response
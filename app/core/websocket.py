@@ -1,14 +1,160 @@
+import asyncio
+import logging
+from collections import deque
+
 import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
 
+from app.core.cache import invalidate_public_wishlist, invalidation_listeners
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Worker-to-worker event, emitted to a room of the same name that clients cannot join
+PUBLIC_WISHLIST_INVALIDATED = "server:public-wishlist-invalidated"
+
+
+class _CacheInvalidationMixin:
+    """Applies public wishlist invalidations published by the other workers to this one's cache."""
+
+    async def _handle_emit(self, message):
+        if message.get("event") != PUBLIC_WISHLIST_INVALIDATED:
+            return await super()._handle_emit(message)
+        # The publishing worker has already invalidated its own cache
+        if message.get("host_id") != self.host_id:
+            invalidate_public_wishlist(message["data"][0], broadcast=False)
+
+
+class _RedisManager(_CacheInvalidationMixin, socketio.AsyncRedisManager):
+    pass
+
+
+class _AioPikaManager(_CacheInvalidationMixin, socketio.AsyncAioPikaManager):
+    pass
+
+
+def _create_client_manager() -> socketio.AsyncManager | None:
+    """Picks the manager that fans emits out to clients of every worker process."""
+    backend = settings.SOCKETIO_MANAGER.lower()
+    if backend == "memory":
+        return None
+    if backend == "redis":
+        return _RedisManager(
+            settings.SOCKETIO_MESSAGE_QUEUE_URL, channel=settings.SOCKETIO_CHANNEL
+        )
+    if backend == "amqp":
+        return _AioPikaManager(
+            settings.SOCKETIO_MESSAGE_QUEUE_URL, channel=settings.SOCKETIO_CHANNEL
+        )
+    raise ValueError(f"Unknown SOCKETIO_MANAGER: {settings.SOCKETIO_MANAGER!r}")
+
+
 sio = socketio.AsyncServer(
     async_mode="asgi",
     cors_allowed_origins=settings.allowed_origins_list,
+    client_manager=_create_client_manager(),
 )
 socket_app = socketio.ASGIApp(sio, socketio_path="/socket.io")
 
 
+def start_client_manager() -> None:
+    """Starts listening to the other workers now; Socket.IO waits for the first client otherwise."""
+    if not sio.manager_initialized:
+        sio.manager_initialized = True
+        sio.manager.initialize()
+
+
+class EventDispatcher:
+    """Emits room events out of band, coalescing bursts into one batched event.
+
+    publish() only queues the event; the first event for a room schedules a
+    flush after the coalescing window. A single queued event is emitted as is,
+    several go out together as one "wishlist:batch" event. When a room's queue
+    is full the oldest event is dropped and counted.
+    """
+
+    def __init__(self, server: socketio.AsyncServer, window: float, max_queue: int):
+        self._server = server
+        self._window = window
+        self._max_queue = max_queue
+        self._queues: dict[str, deque[tuple[str, dict]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.published = 0
+        self.emitted = 0
+        self.batches = 0
+        self.dropped = 0
+
+    def publish(self, room: str, event: str, data: dict) -> None:
+        self.published += 1
+        queue = self._queues.get(room)
+        if queue is None:
+            queue = self._queues[room] = deque()
+            task = asyncio.get_running_loop().create_task(self._flush_later(room))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if len(queue) >= self._max_queue:
+            queue.popleft()
+            self.dropped += 1
+            logger.warning("Dropped realtime event for %s: queue is full", room)
+        queue.append((event, data))
+
+    def broadcast(self, event: str, data) -> None:
+        """Emits event to the room of the same name right away, skipping the room queues."""
+        task = asyncio.get_running_loop().create_task(self._emit(event, data))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _emit(self, event: str, data) -> None:
+        try:
+            await self._server.emit(event, data, room=event)
+        except Exception:
+            logger.exception("Failed to broadcast %s", event)
+
+    async def _flush_later(self, room: str) -> None:
+        await asyncio.sleep(self._window)
+        queue = self._queues.pop(room, None)
+        if not queue:
+            return
+        try:
+            if len(queue) == 1:
+                event, data = queue[0]
+                await self._server.emit(event, data, room=room)
+            else:
+                events = [{"event": event, "data": data} for event, data in queue]
+                await self._server.emit("wishlist:batch", {"events": events}, room=room)
+        except Exception:
+            logger.exception("Failed to emit realtime events to %s", room)
+            return
+        self.batches += 1
+        self.emitted += len(queue)
+
+    async def drain(self) -> None:
+        """Waits for every scheduled flush, e.g. on shutdown."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "pending_rooms": len(self._queues),
+            "published": self.published,
+            "emitted": self.emitted,
+            "batches": self.batches,
+            "dropped": self.dropped,
+        }
+
+
+dispatcher = EventDispatcher(
+    sio,
+    window=settings.SOCKETIO_COALESCE_WINDOW_MS / 1000,
+    max_queue=settings.SOCKETIO_ROOM_QUEUE_SIZE,
+)
+
+if isinstance(sio.manager, AsyncPubSubManager):
+    invalidation_listeners.append(
+        lambda slug: dispatcher.broadcast(PUBLIC_WISHLIST_INVALIDATED, slug)
+    )
+
+
 @sio.event
 async def connect(sid, environ):
     pass
@@ -23,11 +169,11 @@ async def disconnect(sid):
 async def join_wishlist(sid, data):
     slug = data.get("slug") if isinstance(data, dict) else data
     if slug:
-        sio.enter_room(sid, f"wishlist:{slug}")
+        await sio.enter_room(sid, f"wishlist:{slug}")
 
 
 @sio.on("leave:wishlist")
 async def leave_wishlist(sid, data):
     slug = data.get("slug") if isinstance(data, dict) else data
     if slug:
-        sio.leave_room(sid, f"wishlist:{slug}")
+        await sio.leave_room(sid, f"wishlist:{slug}")
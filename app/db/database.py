@@ -1,6 +1,14 @@
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.replicas import ReplicaRouter
 
 engine = create_async_engine(settings.database_url_async, echo=False)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
+instrument_engine(engine, "primary")
+
+replica_engines = [create_async_engine(url, echo=False) for url in settings.database_replica_urls_async]
+for index, replica_engine in enumerate(replica_engines):
+    instrument_engine(replica_engine, f"replica{index}")
+replica_router = ReplicaRouter(replica_engines, async_session)
@@ -0,0 +1,8 @@
+from sqlalchemy.exc import IntegrityError
+
+_FOREIGN_KEY_VIOLATION = "23503"
+
+
+def is_foreign_key_violation(exc: IntegrityError) -> bool:
+    """True when the statement referenced a row that does not exist (any more)."""
+    return getattr(exc.orig, "sqlstate", None) == _FOREIGN_KEY_VIOLATION
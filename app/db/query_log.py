@@ -0,0 +1,29 @@
+import logging
+import re
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:::[\w\[\]]+)?(?:\s*,\s*\?(?:::[\w\[\]]+)?)*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """The statement with parameters, literals and IN lists folded, so repeats compare equal."""
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _LITERAL.sub("?", statement)
+    statement = _LIST.sub("(?, ...)", statement)
+    return _SPACE.sub(" ", statement).strip()
+
+
+def repeated(statements: list[str], threshold: int) -> list[tuple[str, int]]:
+    """Fingerprints run at least threshold times, most frequent first."""
+    counts = Counter(fingerprint(statement) for statement in statements)
+    return [(fp, n) for fp, n in counts.most_common() if n >= threshold]
+
+
+def warn_repeated(statements: list[str], threshold: int, label: str) -> None:
+    for statement, n in repeated(statements, threshold):
+        logger.warning("Probable N+1 in %s: %d x %s", label, n, statement)
@@ -0,0 +1,127 @@
+import asyncio
+import itertools
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Replay lag in seconds; 0 when everything received has been replayed (an idle primary
+# would otherwise look like it lags by the time since its last transaction)
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaRouter:
+    """Round-robin over read replicas that passed their last health check.
+
+    A background task probes every replica for connectivity and replay lag; a replica that
+    fails to connect while opening a session is taken out until the next successful probe.
+    With no healthy replica, sessions come from the primary.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], primary: async_sessionmaker[AsyncSession]):
+        self._engines = engines
+        self._sessions = [async_sessionmaker(e, expire_on_commit=False) for e in engines]
+        self._healthy = [True] * len(engines)
+        self._lag: list[float | None] = [None] * len(engines)
+        self._cursor = itertools.count()
+        self._primary = primary
+        self._task: asyncio.Task | None = None
+        self.replica_sessions = 0
+        self.primary_fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._engines)
+
+    def _next_healthy(self) -> int | None:
+        n = len(self._engines)
+        start = next(self._cursor)
+        for offset in range(n):
+            index = (start + offset) % n
+            if self._healthy[index]:
+                return index
+        return None
+
+    async def open_session(self) -> AsyncSession:
+        """A session on the next healthy replica, or on the primary when none can connect."""
+        for _ in range(len(self._engines)):
+            index = self._next_healthy()
+            if index is None:
+                break
+            session = self._sessions[index]()
+            try:
+                await session.connection()
+            except (OSError, DBAPIError):
+                await session.close()
+                self._mark(index, healthy=False, reason="connection failed")
+                continue
+            self.replica_sessions += 1
+            return session
+        self.primary_fallbacks += 1
+        return self._primary()
+
+    def _mark(self, index: int, *, healthy: bool, reason: str = "") -> None:
+        if self._healthy[index] != healthy:
+            logger.warning("Replica %d is now %s %s", index, "up" if healthy else "down", reason)
+        self._healthy[index] = healthy
+
+    async def check(self) -> None:
+        for index, engine in enumerate(self._engines):
+            try:
+                async with engine.connect() as conn:
+                    lag = float(await conn.scalar(_LAG_QUERY))
+            except (OSError, DBAPIError):
+                self._lag[index] = None
+                self._mark(index, healthy=False, reason="probe failed")
+                continue
+            self._lag[index] = lag
+            self._mark(
+                index,
+                healthy=lag <= settings.REPLICA_MAX_LAG_SECONDS,
+                reason=f"(lag {lag:.1f}s)",
+            )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Replica health check failed")
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for engine in self._engines:
+            await engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {"healthy": healthy, "lag_seconds": lag}
+                for healthy, lag in zip(self._healthy, self._lag)
+            ],
+            "replica_sessions": self.replica_sessions,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
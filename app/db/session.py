@@ -1,10 +1,61 @@
+import uuid
 from collections.abc import AsyncGenerator
 
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.db.database import async_session
+from app.core.cache import TTLCache, recent_wishlist_writes
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.db.database import async_session, replica_router
 
+# Users who committed a write in the last READ_YOUR_WRITES_SECONDS read from the primary
+recent_user_writes = TTLCache(
+    maxsize=settings.READ_YOUR_WRITES_CACHE_SIZE,
+    ttl=settings.READ_YOUR_WRITES_SECONDS,
+)
 
-async def get_db() -> AsyncGenerator[AsyncSession]:
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session) -> None:
+    writer = session.info.get("writer")
+    if writer is not None:
+        recent_user_writes.set(writer, True)
+
+
+def _token_subject(request: Request) -> uuid.UUID | None:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return decode_access_token(token)
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession]:
     async with async_session() as session:
+        # Marked at commit time, before the response goes out, so the next request sees it
+        session.info["writer"] = _token_subject(request)
+        yield session
+
+
+def _needs_primary(request: Request) -> bool:
+    user_id = _token_subject(request)
+    if user_id is not None and recent_user_writes.get(user_id) is not None:
+        return True
+    slug = request.path_params.get("slug")
+    return slug is not None and recent_wishlist_writes.get(slug) is not None
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession]:
+    """Session for read-only handlers, served by a replica when one is configured and healthy.
+
+    Falls back to the primary while the caller's own writes (or writes to the requested
+    wishlist) may not have replicated yet.
+    """
+    if not replica_router.enabled or _needs_primary(request):
+        session = async_session()
+    else:
+        session = await replica_router.open_session()
+    async with session:
         yield session
@@ -1,11 +1,27 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.endpoints import auth, health, items, reservations, wishlists
+from app.api.endpoints import auth, health, items, metrics, reservations, wishlists
 from app.core.config import settings
-from app.core.websocket import socket_app
+from app.core.http import close_http_session
+from app.core.metrics import MetricsMiddleware
+from app.core.websocket import dispatcher, socket_app, start_client_manager
+from app.db.database import replica_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    replica_router.start()
+    start_client_manager()
+    yield
+    await dispatcher.drain()
+    await close_http_session()
+    await replica_router.stop()
 
-app = FastAPI(title="Wishlist API", version="1.0.0")
+
+app = FastAPI(title="Wishlist API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,7 +29,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
+app.add_middleware(MetricsMiddleware)
+
+app.include_router(metrics.router)
 
 app.include_router(health.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
@@ -1,7 +1,7 @@
 import uuid
 from decimal import Decimal
 
-from sqlalchemy import Boolean, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, Numeric, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,15 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 
 class Item(UUIDMixin, TimestampMixin, Base):
     __tablename__ = "items"
+    __table_args__ = (
+        Index(
+            "ix_items_wishlist_id_position_id",
+            "wishlist_id",
+            "position",
+            "id",
+            postgresql_where=text("is_deleted IS false"),
+        ),
+    )
 
     wishlist_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("wishlists.id", ondelete="CASCADE"), nullable=False, index=True
@@ -23,5 +32,16 @@ class Item(UUIDMixin, TimestampMixin, Base):
     position: Mapped[int] = mapped_column(Integer, default=0)
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Denormalized reservation aggregates, maintained by reservation_service
+    reserved_amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), default=Decimal("0"), server_default="0", nullable=False
+    )
+    reservation_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
     wishlist = relationship("Wishlist", back_populates="items")
-    reservations = relationship("Reservation", back_populates="item", cascade="all, delete-orphan")
+    # Reservations go with the item through ON DELETE CASCADE, without loading them first
+    reservations = relationship(
+        "Reservation", back_populates="item", cascade="all, delete-orphan", passive_deletes=True
+    )
@@ -1,7 +1,7 @@
 import uuid
 from decimal import Decimal
 
-from sqlalchemy import Boolean, ForeignKey, Numeric, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, Numeric, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,9 +10,13 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 
 class Reservation(UUIDMixin, TimestampMixin, Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        Index("ix_reservations_item_id_created_at_id", "item_id", "created_at", "id"),
+        Index("ix_reservations_user_id", "user_id", postgresql_where=text("user_id IS NOT NULL")),
+    )
 
     item_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("items.id", ondelete="CASCADE"), nullable=False, index=True
+        UUID(as_uuid=True), ForeignKey("items.id", ondelete="CASCADE"), nullable=False
     )
     user_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
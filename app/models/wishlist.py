@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Boolean, Date, ForeignKey, String, Text
+from sqlalchemy import Boolean, Date, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -9,9 +9,12 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 
 class Wishlist(UUIDMixin, TimestampMixin, Base):
     __tablename__ = "wishlists"
+    __table_args__ = (
+        Index("ix_wishlists_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
@@ -20,4 +23,6 @@ class Wishlist(UUIDMixin, TimestampMixin, Base):
     event_date: Mapped[str | None] = mapped_column(Date)
 
     user = relationship("User", back_populates="wishlists")
-    items = relationship("Item", back_populates="wishlist", cascade="all, delete-orphan")
+    items = relationship(
+        "Item", back_populates="wishlist", cascade="all, delete-orphan", passive_deletes=True
+    )
@@ -24,6 +24,15 @@ class ItemUpdate(BaseModel):
     position: int | None = None
 
 
+class ItemReorder(BaseModel):
+    item_ids: list[uuid.UUID] = Field(min_length=1)
+
+
+class ItemMove(BaseModel):
+    """Places the item right after after_id, or first when it is None."""
+    after_id: uuid.UUID | None = None
+
+
 class ItemResponse(BaseModel):
     id: uuid.UUID
     wishlist_id: uuid.UUID
@@ -41,6 +50,17 @@ class ItemResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ItemImportError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class ItemImportResponse(BaseModel):
+    created: int
+    items: list[ItemResponse]
+    errors: list[ItemImportError]
+
+
 class AutofillRequest(BaseModel):
     url: str
 
@@ -12,6 +12,19 @@ class ReservationCreate(BaseModel):
     message: str | None = None
 
 
+class ReservationBatchLine(BaseModel):
+    item_id: uuid.UUID
+    amount: float = Field(gt=0)
+    is_full_reservation: bool = False
+    message: str | None = None
+
+
+class ReservationBatchCreate(BaseModel):
+    items: list[ReservationBatchLine] = Field(min_length=1, max_length=50)
+    guest_name: str | None = None
+    guest_email: str | None = None
+
+
 class ReservationUpdate(BaseModel):
     amount: float | None = Field(None, gt=0)
     message: str | None = None
@@ -4,12 +4,14 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
 )
 from app.models.user import User
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
@@ -21,11 +23,15 @@ async def register(db: AsyncSession, data: RegisterRequest) -> TokenResponse:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
 
     user = User(
+        id=uuid.uuid4(),
         email=data.email,
-        password_hash=hash_password(data.password),
+        password_hash=await hash_password_async(data.password),
         full_name=data.full_name,
     )
     db.add(user)
+    # The request carried no token to name the writer, so /auth/me right after registering
+    # would go to a replica that may not have the user yet
+    db.info["writer"] = user.id
     await db.commit()
     await db.refresh(user)
 
@@ -37,9 +43,15 @@ async def login(db: AsyncSession, data: LoginRequest) -> TokenResponse:
     user = result.scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    if not verify_password(data.password, user.password_hash):
+    if not await verify_password_async(data.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    # Transparently upgrade hashes made with a different cost factor
+    if settings.PASSWORD_REHASH_ON_LOGIN and password_needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(data.password)
+        db.info["writer"] = user.id
+        await db.commit()
+
     return _create_tokens(user.id)
 
 
@@ -0,0 +1,150 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator, Iterator
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+# Characters that may follow a complete scalar element in the array
+_SCALAR_END = frozenset((" ", "\t", "\r", "\n", ",", "]"))
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _check_row_size(size: int) -> None:
+    if size > settings.ITEM_IMPORT_MAX_ROW_CHARS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"A row is longer than {settings.ITEM_IMPORT_MAX_ROW_CHARS} characters",
+        )
+
+
+async def _decode(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    received = 0
+    try:
+        async for chunk in chunks:
+            received += len(chunk)
+            if received > settings.ITEM_IMPORT_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                    detail=f"At most {settings.ITEM_IMPORT_MAX_BYTES} bytes per import",
+                )
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise _invalid("Body is not valid UTF-8")
+    if text:
+        yield text
+
+
+async def iter_json_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[object]:
+    """Yields the elements of a top-level JSON array as soon as each one is complete."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = finished = expect_comma = after_comma = False
+    async for text in _decode(chunks):
+        buffer += text
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos == len(buffer) or finished:
+                break
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise _invalid("Expected a JSON array")
+                started = True
+                pos += 1
+            elif char == "]":
+                if after_comma:
+                    raise _invalid("Invalid JSON array")
+                finished = True
+                pos += 1
+            elif expect_comma:
+                if char != ",":
+                    raise _invalid("Invalid JSON array")
+                expect_comma = False
+                after_comma = True
+                pos += 1
+            else:
+                try:
+                    row, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # element not complete yet
+                if not isinstance(row, dict | list) and buffer[end:end + 1] not in _SCALAR_END:
+                    break  # a scalar such as 12 in 12.5 may continue in the next chunk
+                yield row
+                pos = end
+                expect_comma = True
+                after_comma = False
+        buffer = buffer[pos:]
+        _check_row_size(len(buffer))
+        if finished and buffer.strip():
+            raise _invalid("Unexpected data after the JSON array")
+
+    if not finished:
+        raise _invalid("Invalid or truncated JSON array")
+
+
+class _NeedMoreData(Exception):
+    """Raised into csv.reader where the lines received so far run out."""
+
+
+def _lines(lines: list[str], final: bool) -> Iterator[str]:
+    yield from lines
+    if not final:
+        raise _NeedMoreData
+
+
+def _parse_records(lines: list[str], final: bool) -> list[list[str]]:
+    """Parses the complete records in lines and removes their lines from the list."""
+    reader = csv.reader(_lines(lines, final))
+    records = []
+    parsed = 0
+    try:
+        for record in reader:
+            records.append(record)
+            parsed = reader.line_num
+    except _NeedMoreData:
+        pass  # the last record continues in lines not received yet; it is parsed again then
+    except csv.Error as exc:
+        raise _invalid(f"Invalid CSV: {exc}")
+    del lines[:parsed]
+    return records
+
+
+async def _iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[list[str]]:
+    """Yields CSV records as soon as every line of the record has arrived."""
+    lines: list[str] = []
+    pending = ""
+    async for text in _decode(chunks):
+        *complete, pending = (pending + text).split("\n")
+        lines.extend(line + "\n" for line in complete)
+        for record in _parse_records(lines, final=False):
+            yield record
+        _check_row_size(len(pending) + sum(map(len, lines)))
+    if pending:
+        lines.append(pending)
+    for record in _parse_records(lines, final=True):
+        yield record
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """Yields one dict per CSV data row, keyed by the header row; empty cells are omitted."""
+    header = None
+    async for values in _iter_csv_records(chunks):
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        yield {name: value for name, value in zip(header, values) if value != ""}
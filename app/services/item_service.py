@@ -1,13 +1,20 @@
 import uuid
+from collections.abc import AsyncIterator
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from pydantic import ValidationError
+from sqlalchemy import Integer, column, delete, func, insert, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager
 
+from app.core.cache import invalidate_public_wishlist
+from app.core.config import settings
+from app.db.errors import is_foreign_key_violation
 from app.models.item import Item
 from app.models.wishlist import Wishlist
-from app.schemas.item import ItemCreate, ItemUpdate
+from app.schemas.item import ItemCreate, ItemImportError, ItemImportResponse, ItemResponse, ItemUpdate
 
 
 async def _get_wishlist_owned(db: AsyncSession, wishlist_id: uuid.UUID, user_id: uuid.UUID) -> Wishlist:
@@ -23,7 +30,8 @@ async def _get_wishlist_owned(db: AsyncSession, wishlist_id: uuid.UUID, user_id:
 async def _get_item_owned(db: AsyncSession, item_id: uuid.UUID, user_id: uuid.UUID) -> Item:
     result = await db.execute(
         select(Item)
-        .join(Wishlist)
+        .join(Item.wishlist)
+        .options(contains_eager(Item.wishlist))
         .where(Item.id == item_id, Wishlist.user_id == user_id, Item.is_deleted.is_(False))
     )
     item = result.scalar_one_or_none()
@@ -35,14 +43,90 @@ async def _get_item_owned(db: AsyncSession, item_id: uuid.UUID, user_id: uuid.UU
 async def create_item(
     db: AsyncSession, wishlist_id: uuid.UUID, user_id: uuid.UUID, data: ItemCreate
 ) -> Item:
-    await _get_wishlist_owned(db, wishlist_id, user_id)
+    wishlist = await _get_wishlist_owned(db, wishlist_id, user_id)
     item = Item(wishlist_id=wishlist_id, **data.model_dump())
     db.add(item)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        # The wishlist was deleted after the ownership check
+        if is_foreign_key_violation(exc):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        raise
+    invalidate_public_wishlist(wishlist.slug)
     await db.refresh(item)
     return item
 
 
+async def import_items(
+    db: AsyncSession,
+    wishlist_id: uuid.UUID,
+    user_id: uuid.UUID,
+    rows: AsyncIterator[object],
+) -> ItemImportResponse:
+    """Validates rows as they stream in and inserts the valid ones in multi-row batches.
+
+    Invalid rows are reported by their 1-based number and skipped; everything
+    valid is committed together at the end. Imported items go after the existing
+    ones, in the order of the rows.
+    """
+    wishlist = await _get_wishlist_owned(db, wishlist_id, user_id)
+    result = await db.execute(
+        select(func.max(Item.position)).where(Item.wishlist_id == wishlist_id, Item.is_deleted.is_(False))
+    )
+    last_position = result.scalar_one()
+    position = 0 if last_position is None else last_position + settings.ITEM_POSITION_GAP
+    items = Item.__table__
+    statement = insert(items).returning(*items.c, sort_by_parameter_order=True)
+
+    created: list[ItemResponse] = []
+    errors: list[ItemImportError] = []
+    batch: list[dict] = []
+
+    async def flush() -> None:
+        if batch:
+            try:
+                result = await db.execute(statement, batch)
+            except IntegrityError as exc:
+                await db.rollback()
+                if is_foreign_key_violation(exc):
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+                raise
+            created.extend(ItemResponse.model_validate(row) for row in result.mappings())
+            batch.clear()
+
+    row_number = 0
+    async for row in rows:
+        row_number += 1
+        if row_number > settings.ITEM_IMPORT_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail=f"At most {settings.ITEM_IMPORT_MAX_ROWS} rows per import",
+            )
+        try:
+            data = ItemCreate.model_validate(row)
+        except ValidationError as exc:
+            errors.append(ItemImportError(
+                row=row_number,
+                errors=[
+                    f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                    for error in exc.errors()
+                ],
+            ))
+            continue
+        batch.append({"wishlist_id": wishlist_id, **data.model_dump(), "position": position})
+        position += settings.ITEM_POSITION_GAP
+        if len(batch) >= settings.ITEM_IMPORT_BATCH_SIZE:
+            await flush()
+    await flush()
+
+    await db.commit()
+    if created:
+        invalidate_public_wishlist(wishlist.slug)
+    return ItemImportResponse(created=len(created), items=created, errors=errors)
+
+
 async def update_item(
     db: AsyncSession, item_id: uuid.UUID, user_id: uuid.UUID, data: ItemUpdate
 ) -> Item:
@@ -51,21 +135,114 @@ async def update_item(
     for key, value in update_data.items():
         setattr(item, key, value)
     await db.commit()
+    invalidate_public_wishlist(item.wishlist.slug)
+    await db.refresh(item)
+    return item
+
+
+async def _write_positions(
+    db: AsyncSession, wishlist_id: uuid.UUID, item_ids: list[uuid.UUID]
+) -> int:
+    """Spreads positions over item_ids in one UPDATE ... FROM (VALUES ...); returns rows updated."""
+    positions = values(
+        column("id", UUID(as_uuid=True)), column("position", Integer), name="positions"
+    ).data([(item_id, index * settings.ITEM_POSITION_GAP) for index, item_id in enumerate(item_ids)])
+    result = await db.execute(
+        update(Item)
+        .where(
+            Item.id == positions.c.id,
+            Item.wishlist_id == wishlist_id,
+            Item.is_deleted.is_(False),
+        )
+        .values(position=positions.c.position)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def reorder_items(
+    db: AsyncSession, wishlist_id: uuid.UUID, user_id: uuid.UUID, item_ids: list[uuid.UUID]
+) -> None:
+    if len(set(item_ids)) != len(item_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate item in order")
+    wishlist = await _get_wishlist_owned(db, wishlist_id, user_id)
+    # A partial order would leave the missing items at stale positions among the new ones
+    result = await db.execute(
+        select(Item.id).where(Item.wishlist_id == wishlist_id, Item.is_deleted.is_(False))
+    )
+    if set(result.scalars()) != set(item_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Order must list every item of the wishlist exactly once",
+        )
+    if await _write_positions(db, wishlist_id, item_ids) != len(item_ids):
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    await db.commit()
+    invalidate_public_wishlist(wishlist.slug)
+
+
+async def move_item(
+    db: AsyncSession, item_id: uuid.UUID, user_id: uuid.UUID, after_id: uuid.UUID | None
+) -> Item:
+    """Moves one item, touching only its own row while there is a gap to fit it in."""
+    item = await _get_item_owned(db, item_id, user_id)
+    if after_id == item_id:
+        return item
+
+    live = (Item.wishlist_id == item.wishlist_id, Item.is_deleted.is_(False), Item.id != item_id)
+    previous = None
+    if after_id is not None:
+        result = await db.execute(select(Item.position, Item.id).where(Item.id == after_id, *live))
+        previous = result.one_or_none()
+        if previous is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+
+    following_query = select(Item.position).where(*live).order_by(Item.position, Item.id).limit(1)
+    if previous is not None:
+        following_query = following_query.where(
+            tuple_(Item.position, Item.id) > tuple_(previous.position, previous.id)
+        )
+    following = (await db.execute(following_query)).scalar_one_or_none()
+
+    if previous is None and following is None:
+        position = 0
+    elif previous is None:
+        position = following - settings.ITEM_POSITION_GAP
+    elif following is None:
+        position = previous.position + settings.ITEM_POSITION_GAP
+    elif following - previous.position > 1:
+        position = (previous.position + following) // 2
+    else:
+        position = None
+
+    if position is not None:
+        item.position = position
+    else:
+        # No room between the neighbours: renumber the whole list once
+        result = await db.execute(
+            select(Item.id).where(*live).order_by(Item.position, Item.id)
+        )
+        order = list(result.scalars())
+        order.insert(order.index(after_id) + 1, item_id)
+        await _write_positions(db, item.wishlist_id, order)
+
+    await db.commit()
+    invalidate_public_wishlist(item.wishlist.slug)
     await db.refresh(item)
     return item
 
 
 async def delete_item(db: AsyncSession, item_id: uuid.UUID, user_id: uuid.UUID) -> None:
     item = await _get_item_owned(db, item_id, user_id)
-    # Soft delete if item has reservations
+    # Hard delete only while nothing is reserved; a concurrent reservation holds the row lock,
+    # so the condition is re-checked against its outcome. Otherwise soft delete.
     result = await db.execute(
-        select(Item)
-        .options(selectinload(Item.reservations))
-        .where(Item.id == item_id)
+        delete(Item)
+        .where(Item.id == item_id, Item.reservation_count == 0)
+        .execution_options(synchronize_session=False)
     )
-    item_with_rels = result.scalar_one()
-    if item_with_rels.reservations:
-        item_with_rels.is_deleted = True
-    else:
-        await db.delete(item_with_rels)
+    if result.rowcount == 0:
+        item.is_deleted = True
     await db.commit()
+    invalidate_public_wishlist(item.wishlist.slug)
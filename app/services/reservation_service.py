@@ -1,45 +1,87 @@
 import uuid
+from datetime import datetime
 from decimal import Decimal
+from typing import NamedTuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import (
+    Numeric,
+    String,
+    Text,
+    and_,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.core.cache import invalidate_public_wishlist
+from app.core.pagination import PageParams
+from app.core.security import CurrentUser
+from app.db.errors import is_foreign_key_violation
 from app.models.item import Item
 from app.models.reservation import Reservation
-from app.models.user import User
 from app.models.wishlist import Wishlist
-from app.schemas.reservation import ReservationCreate, ReservationUpdate
+from app.schemas.reservation import ReservationBatchCreate, ReservationCreate, ReservationUpdate
 
+_MAX_RESERVE_ATTEMPTS = 5
 
-async def create_reservation(
-    db: AsyncSession,
-    item_id: uuid.UUID,
-    data: ReservationCreate,
-    user: User | None = None,
-) -> Reservation:
-    # Lock the item row to prevent race conditions
-    result = await db.execute(
-        select(Item)
-        .options(selectinload(Item.reservations), selectinload(Item.wishlist))
-        .where(Item.id == item_id, Item.is_deleted.is_(False))
-        .with_for_update()
+
+class ReservationResult(NamedTuple):
+    """Outcome of a reservation mutation, with everything needed for the realtime event."""
+    reservation: Reservation
+    item_id: uuid.UUID
+    wishlist_slug: str
+    reserved_amount: Decimal
+    reservation_count: int
+
+
+def _reservation_from_row(row) -> Reservation:
+    return Reservation(
+        id=row.id,
+        item_id=row.item_id,
+        user_id=row.user_id,
+        guest_name=row.guest_name,
+        guest_email=row.guest_email,
+        amount=row.amount,
+        is_full_reservation=row.is_full_reservation,
+        message=row.message,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
     )
-    item = result.scalar_one_or_none()
-    if item is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
 
-    # Owner cannot reserve their own items
-    if user and item.wishlist.user_id == user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot reserve your own item")
 
-    # Guest must provide name
-    if user is None and not data.guest_name:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Guest name is required")
+async def _insert_reservations(db: AsyncSession, user: CurrentUser | None, statement, params=None):
+    # A cached identity can outlive its user; the insert then hits the users foreign key
+    try:
+        return await db.execute(statement, params)
+    except IntegrityError as exc:
+        await db.rollback()
+        if user is not None and is_foreign_key_violation(exc):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        raise
 
-    reserved_total = sum(r.amount for r in item.reservations)
-    remaining = Decimal(str(item.price)) - reserved_total
+
+def _check_reservation_owner(reservation_user_id: uuid.UUID | None, user: CurrentUser | None) -> None:
+    # Only the reservation creator can change it
+    if user and reservation_user_id != user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your reservation")
+    if user is None and reservation_user_id is not None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your reservation")
+
+
+def _validate_contribution(
+    price: Decimal, reserved_total: Decimal, data: ReservationCreate
+) -> Decimal:
+    """Applies the contribution rules and returns the amount to reserve."""
+    remaining = Decimal(str(price)) - reserved_total
 
     if remaining <= 0:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Item is fully reserved")
@@ -52,10 +94,10 @@ async def create_reservation(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Cannot fully reserve — partial contributions exist",
             )
-        amount = Decimal(str(item.price))
+        amount = Decimal(str(price))
     else:
         # Validate minimum contribution: min(10% of price, 100 RUB)
-        min_amount = min(Decimal(str(item.price)) * Decimal("0.1"), Decimal("100"))
+        min_amount = min(Decimal(str(price)) * Decimal("0.1"), Decimal("100"))
         if amount < min_amount:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -66,89 +108,361 @@ async def create_reservation(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Maximum contribution is {remaining}",
             )
+    return amount
+
+
+def _reserve_statement(
+    reservation_id: uuid.UUID,
+    item_id: uuid.UUID,
+    data: ReservationCreate,
+    user: CurrentUser | None,
+):
+    """Validates and inserts a reservation in one statement.
+
+    The UPDATE of the item's aggregates re-checks every rule against the
+    latest row version, so concurrent contributions cannot overbook the item;
+    the INSERT only runs if that UPDATE matched. The outer SELECT returns the
+    item as of the statement's snapshot so a rejection can be explained.
+    """
+    amount = Decimal(str(data.amount))
+    if data.is_full_reservation:
+        new_amount = Item.price
+        allowed = Item.reserved_amount == 0
+    else:
+        new_amount = literal(amount, Numeric(10, 2))
+        allowed = and_(
+            new_amount >= func.least(Item.price * Decimal("0.1"), Decimal("100")),
+            new_amount <= Item.price - Item.reserved_amount,
+        )
+    if user is not None:
+        allowed = and_(allowed, Wishlist.user_id != user.id)
+
+    bumped = (
+        update(Item)
+        .where(
+            Item.id == item_id,
+            Item.wishlist_id == Wishlist.id,
+            Item.is_deleted.is_(False),
+            Item.reserved_amount < Item.price,
+            allowed,
+        )
+        .values(
+            reserved_amount=Item.reserved_amount + new_amount,
+            reservation_count=Item.reservation_count + 1,
+        )
+        .returning(
+            Item.id,
+            new_amount.label("amount"),
+            Item.reserved_amount.label("new_reserved_amount"),
+            Item.reservation_count.label("new_reservation_count"),
+        )
+        .cte("bumped")
+    )
+
+    reservations = Reservation.__table__
+    inserted = (
+        insert(reservations)
+        .from_select(
+            ["id", "item_id", "user_id", "guest_name", "guest_email", "amount",
+             "is_full_reservation", "message"],
+            select(
+                literal(reservation_id, UUID(as_uuid=True)),
+                bumped.c.id,
+                literal(user.id if user else None, UUID(as_uuid=True)),
+                literal(data.guest_name if user is None else None, String),
+                literal(data.guest_email if user is None else None, String),
+                bumped.c.amount,
+                literal(data.is_full_reservation),
+                literal(data.message, Text),
+            ),
+        )
+        .returning(*reservations.c)
+        .cte("inserted")
+    )
+
+    return (
+        select(
+            Item.price,
+            Item.reserved_amount,
+            Wishlist.user_id.label("owner_id"),
+            Wishlist.slug,
+            bumped.c.new_reserved_amount,
+            bumped.c.new_reservation_count,
+            *inserted.c,
+        )
+        .join_from(Item, Wishlist, Item.wishlist_id == Wishlist.id)
+        .outerjoin(bumped, true())
+        .outerjoin(inserted, true())
+        .where(Item.id == item_id, Item.is_deleted.is_(False))
+    )
+
+
+async def create_reservation(
+    db: AsyncSession,
+    item_id: uuid.UUID,
+    data: ReservationCreate,
+    user: CurrentUser | None = None,
+) -> ReservationResult:
+    # Guest must provide name; checked up front, the statement assumes it
+    if user is None and not data.guest_name:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Guest name is required")
+
+    for _ in range(_MAX_RESERVE_ATTEMPTS):
+        result = await _insert_reservations(db, user, _reserve_statement(uuid.uuid4(), item_id, data, user))
+        row = result.one_or_none()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+        if row.id is not None:
+            break
+
+        await db.rollback()
+        # Owner cannot reserve their own items
+        if user and row.owner_id == user.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot reserve your own item")
+
+        _validate_contribution(row.price, row.reserved_amount, data)
+        # The snapshot allowed it but a concurrent contribution got there first; retry
+    else:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Item is being reserved, try again")
 
-    reservation = Reservation(
-        item_id=item_id,
-        user_id=user.id if user else None,
-        guest_name=data.guest_name if user is None else None,
-        guest_email=data.guest_email if user is None else None,
-        amount=amount,
-        is_full_reservation=data.is_full_reservation,
-        message=data.message,
-    )
-    db.add(reservation)
     await db.commit()
-    await db.refresh(reservation)
-    return reservation
+    invalidate_public_wishlist(row.slug)
+    return ReservationResult(
+        reservation=_reservation_from_row(row),
+        item_id=item_id,
+        wishlist_slug=row.slug,
+        reserved_amount=row.new_reserved_amount,
+        reservation_count=row.new_reservation_count,
+    )
 
 
 async def update_reservation(
     db: AsyncSession,
     reservation_id: uuid.UUID,
     data: ReservationUpdate,
-    user: User | None = None,
-) -> Reservation:
+    user: CurrentUser | None = None,
+) -> ReservationResult:
+    reservations = Reservation.__table__
     result = await db.execute(
-        select(Reservation).where(Reservation.id == reservation_id)
+        select(*reservations.c, Item.reserved_amount, Item.reservation_count, Wishlist.slug)
+        .join_from(reservations, Item, Item.id == reservations.c.item_id)
+        .join(Wishlist, Wishlist.id == Item.wishlist_id)
+        .where(reservations.c.id == reservation_id)
+        .with_for_update(of=reservations)
     )
-    reservation = result.scalar_one_or_none()
-    if reservation is None:
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
 
-    # Only the reservation creator can update
-    if user and reservation.user_id != user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your reservation")
-    if user is None and reservation.user_id is not None:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your reservation")
+    _check_reservation_owner(row.user_id, user)
 
+    values = {}
     if data.amount is not None:
-        reservation.amount = Decimal(str(data.amount))
+        values["amount"] = Decimal(str(data.amount))
     if data.message is not None:
-        reservation.message = data.message
+        values["message"] = data.message
+    if not values:
+        await db.rollback()
+        return ReservationResult(
+            _reservation_from_row(row), row.item_id, row.slug, row.reserved_amount, row.reservation_count
+        )
 
+    # Reservation and item aggregates change in one statement; the row lock
+    # taken above keeps the old amount, and so the delta, stable
+    updated = (
+        update(reservations)
+        .where(reservations.c.id == reservation_id)
+        .values(**values)
+        .returning(*reservations.c)
+        .cte("updated")
+    )
+    result = await db.execute(
+        update(Item)
+        .where(Item.id == updated.c.item_id)
+        .values(reserved_amount=Item.reserved_amount + (updated.c.amount - row.amount))
+        .returning(Item.reserved_amount, Item.reservation_count, *updated.c)
+        .execution_options(synchronize_session=False)
+    )
+    updated_row = result.one()
     await db.commit()
-    await db.refresh(reservation)
-    return reservation
+    if "amount" in values:
+        invalidate_public_wishlist(row.slug)
+    return ReservationResult(
+        reservation=_reservation_from_row(updated_row),
+        item_id=row.item_id,
+        wishlist_slug=row.slug,
+        reserved_amount=updated_row.reserved_amount,
+        reservation_count=updated_row.reservation_count,
+    )
 
 
 async def delete_reservation(
     db: AsyncSession,
     reservation_id: uuid.UUID,
-    user: User | None = None,
-) -> None:
+    user: CurrentUser | None = None,
+) -> ReservationResult:
+    reservations = Reservation.__table__
     result = await db.execute(
-        select(Reservation).where(Reservation.id == reservation_id)
+        select(reservations.c.user_id).where(reservations.c.id == reservation_id)
     )
-    reservation = result.scalar_one_or_none()
-    if reservation is None:
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
 
-    if user and reservation.user_id != user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your reservation")
-    if user is None and reservation.user_id is not None:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your reservation")
+    _check_reservation_owner(row.user_id, user)
+
+    deleted = (
+        delete(reservations)
+        .where(reservations.c.id == reservation_id)
+        .returning(*reservations.c)
+        .cte("deleted")
+    )
+    result = await db.execute(
+        update(Item)
+        .where(Item.id == deleted.c.item_id, Item.wishlist_id == Wishlist.id)
+        .values(
+            reserved_amount=Item.reserved_amount - deleted.c.amount,
+            reservation_count=Item.reservation_count - 1,
+        )
+        .returning(Item.reserved_amount, Item.reservation_count, Wishlist.slug, *deleted.c)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_row = result.one_or_none()
+    if deleted_row is None:
+        # Deleted concurrently between the read and the write
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
 
-    await db.delete(reservation)
     await db.commit()
+    invalidate_public_wishlist(deleted_row.slug)
+    return ReservationResult(
+        reservation=_reservation_from_row(deleted_row),
+        item_id=deleted_row.item_id,
+        wishlist_slug=deleted_row.slug,
+        reserved_amount=deleted_row.reserved_amount,
+        reservation_count=deleted_row.reservation_count,
+    )
+
+
+async def create_reservations_batch(
+    db: AsyncSession,
+    slug: str,
+    data: ReservationBatchCreate,
+    user: CurrentUser | None = None,
+) -> list[ReservationResult]:
+    """Reserves several items of one wishlist in a single all-or-nothing transaction."""
+    item_ids = [line.item_id for line in data.items]
+    if len(set(item_ids)) != len(item_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate item in batch")
+
+    # Lock in primary key order so overlapping batches cannot deadlock
+    result = await db.execute(
+        select(
+            Item.id,
+            Item.price,
+            Item.reserved_amount,
+            Item.reservation_count,
+            Wishlist.user_id.label("owner_id"),
+        )
+        .join(Wishlist, Wishlist.id == Item.wishlist_id)
+        .where(Wishlist.slug == slug, Item.id.in_(item_ids), Item.is_deleted.is_(False))
+        .order_by(Item.id)
+        .with_for_update(of=Item)
+    )
+    items = {row.id: row for row in result}
+    if len(items) != len(item_ids):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+
+    # Owner cannot reserve their own items
+    owner_id = next(iter(items.values())).owner_id
+    if user and owner_id == user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot reserve your own item")
+
+    # Guest must provide name
+    if user is None and not data.guest_name:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Guest name is required")
+
+    reservation_rows = []
+    aggregates = []
+    for line in data.items:
+        item = items[line.item_id]
+        try:
+            amount = _validate_contribution(
+                item.price,
+                item.reserved_amount,
+                ReservationCreate(amount=line.amount, is_full_reservation=line.is_full_reservation),
+            )
+        except HTTPException as exc:
+            raise HTTPException(status_code=exc.status_code, detail=f"{exc.detail} (item {item.id})")
+        reservation_rows.append({
+            "id": uuid.uuid4(),
+            "item_id": item.id,
+            "user_id": user.id if user else None,
+            "guest_name": data.guest_name if user is None else None,
+            "guest_email": data.guest_email if user is None else None,
+            "amount": amount,
+            "is_full_reservation": line.is_full_reservation,
+            "message": line.message,
+        })
+        aggregates.append({
+            "id": item.id,
+            "reserved_amount": item.reserved_amount + amount,
+            "reservation_count": item.reservation_count + 1,
+        })
+
+    reservations = Reservation.__table__
+    result = await _insert_reservations(
+        db,
+        user,
+        insert(reservations).returning(*reservations.c, sort_by_parameter_order=True),
+        reservation_rows,
+    )
+    inserted = result.all()
+    await db.execute(update(Item), aggregates)
+    await db.commit()
+    invalidate_public_wishlist(slug)
+
+    return [
+        ReservationResult(
+            reservation=_reservation_from_row(row),
+            item_id=row.item_id,
+            wishlist_slug=slug,
+            reserved_amount=aggregate["reserved_amount"],
+            reservation_count=aggregate["reservation_count"],
+        )
+        for row, aggregate in zip(inserted, aggregates)
+    ]
 
 
 async def get_item_reservations(
     db: AsyncSession,
     item_id: uuid.UUID,
-    requester: User | None = None,
+    requester: CurrentUser | None = None,
+    page: PageParams | None = None,
 ) -> tuple[list[Reservation], bool]:
-    """Returns (reservations, is_owner)."""
+    """Returns (reservations, is_owner), oldest first.
+
+    A page is keyed on (created_at, id) and holds up to `page.limit + 1` rows.
+    """
     result = await db.execute(
-        select(Item).options(selectinload(Item.wishlist)).where(Item.id == item_id)
+        select(Wishlist.user_id).join(Item, Item.wishlist_id == Wishlist.id).where(Item.id == item_id)
     )
-    item = result.scalar_one_or_none()
-    if item is None:
+    owner_id = result.scalar_one_or_none()
+    if owner_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
 
-    is_owner = requester is not None and item.wishlist.user_id == requester.id
+    is_owner = requester is not None and owner_id == requester.id
 
-    res_result = await db.execute(
-        select(Reservation).where(Reservation.item_id == item_id).order_by(Reservation.created_at)
+    stmt = (
+        select(Reservation)
+        .where(Reservation.item_id == item_id)
+        .order_by(Reservation.created_at, Reservation.id)
     )
+    if page is not None and page.enabled:
+        after = page.after(datetime, uuid.UUID)
+        if after is not None:
+            stmt = stmt.where(tuple_(Reservation.created_at, Reservation.id) > after)
+        stmt = stmt.limit(page.limit + 1)
+    res_result = await db.execute(stmt)
     reservations = list(res_result.scalars().all())
     return reservations, is_owner
@@ -1,66 +1,198 @@
-import re
-
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import json
+import time
+from contextlib import aclosing
+from html.parser import HTMLParser
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http import FetchError, stream_text
+from app.core.metrics import scraper_fetch_duration
 from app.schemas.item import AutofillResponse
 
+_TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "ymclid", "_openstat",
+    "mc_cid", "mc_eid", "igshid", "spm", "ref", "ref_src",
+})
+_PRICE_META = ("og:price:amount", "product:price:amount")
+_HEAD_META = ("og:title", "og:description", "og:image")
 
-def scrape_url(url: str) -> AutofillResponse:
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        resp = requests.get(url, headers=headers, timeout=10)
-        resp.raise_for_status()
-    except requests.RequestException:
-        return AutofillResponse()
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    title = _get_meta(soup, "og:title") or _get_tag(soup, "title")
-    description = _get_meta(soup, "og:description") or _get_meta(soup, "description")
-    image_url = _get_meta(soup, "og:image")
-    price = _extract_price(soup)
-
-    return AutofillResponse(
-        title=title,
-        description=description,
-        image_url=image_url,
-        price=price,
-    )
+autofill_cache = TTLCache(
+    maxsize=settings.AUTOFILL_CACHE_SIZE,
+    ttl=settings.AUTOFILL_CACHE_TTL_SECONDS,
+)
+# Fetches in progress, keyed by normalized URL, shared by concurrent callers
+_in_flight: dict[str, asyncio.Task] = {}
 
 
-def _get_meta(soup: BeautifulSoup, property_name: str) -> str | None:
-    tag = soup.find("meta", attrs={"property": property_name}) or soup.find(
-        "meta", attrs={"name": property_name}
-    )
-    if tag:
-        return tag.get("content")
-    return None
+class PageExtractor(HTMLParser):
+    """Incremental extractor of the meta tags, <title> and JSON-LD that autofill needs.
+
+    Feed it chunks as they arrive and stop reading once `complete` is true;
+    no document tree is built.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta_by_property: dict[str, str] = {}
+        self.meta_by_name: dict[str, str] = {}
+        self.title: str | None = None
+        self.jsonld_price: float | None = None
+        self.head_closed = False
+        self._title_parts: list[str] | None = None
+        self._jsonld_parts: list[str] | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            attrs = dict(attrs)
+            content = attrs.get("content")
+            if content is None:
+                return
+            if attrs.get("property"):
+                self.meta_by_property.setdefault(attrs["property"], content)
+            if attrs.get("name"):
+                self.meta_by_name.setdefault(attrs["name"], content)
+        elif tag == "title" and self.title is None:
+            self._title_parts = []
+        elif tag == "script":
+            script_type = (dict(attrs).get("type") or "").strip().lower()
+            if script_type == "application/ld+json" and self.jsonld_price is None:
+                self._jsonld_parts = []
+        elif tag == "body":
+            self.head_closed = True
 
+    def handle_endtag(self, tag):
+        if tag == "title" and self._title_parts is not None:
+            self.title = "".join(self._title_parts).strip()
+            self._title_parts = None
+        elif tag == "script" and self._jsonld_parts is not None:
+            self.jsonld_price = _jsonld_price("".join(self._jsonld_parts))
+            self._jsonld_parts = None
+        elif tag == "head":
+            self.head_closed = True
 
-def _get_tag(soup: BeautifulSoup, tag_name: str) -> str | None:
-    tag = soup.find(tag_name)
-    return tag.get_text(strip=True) if tag else None
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        elif self._jsonld_parts is not None:
+            self._jsonld_parts.append(data)
 
+    def get_meta(self, key: str) -> str | None:
+        return self.meta_by_property.get(key) or self.meta_by_name.get(key)
 
-def _extract_price(soup: BeautifulSoup) -> float | None:
-    price_meta = _get_meta(soup, "og:price:amount") or _get_meta(soup, "product:price:amount")
-    if price_meta:
+    @property
+    def meta_price(self) -> float | None:
+        for key in _PRICE_META:
+            price = _parse_price(self.get_meta(key))
+            if price is not None:
+                return price
+        return None
+
+    @property
+    def price(self) -> float | None:
+        meta_price = self.meta_price
+        return meta_price if meta_price is not None else self.jsonld_price
+
+    @property
+    def complete(self) -> bool:
+        # A meta price outranks JSON-LD, so a JSON-LD price only settles it once the head is over
+        if self.meta_price is not None and all(self.get_meta(key) for key in _HEAD_META):
+            return True
+        return self.head_closed and self.price is not None
+
+    def result(self) -> AutofillResponse:
+        return AutofillResponse(
+            title=self.get_meta("og:title") or self.title,
+            description=self.get_meta("og:description") or self.get_meta("description"),
+            image_url=self.get_meta("og:image"),
+            price=self.price,
+        )
+
+
+def _parse_price(value) -> float | None:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, str):
         try:
-            return float(price_meta.replace(",", ".").replace(" ", ""))
+            return float(value.replace(",", ".").replace(" ", "").replace("\xa0", ""))
         except ValueError:
-            pass
-
-    # Try JSON-LD
-    for script in soup.find_all("script", type="application/ld+json"):
-        text = script.get_text()
-        match = re.search(r'"price"\s*:\s*"?([\d.,\s]+)"?', text)
-        if match:
-            try:
-                return float(match.group(1).replace(",", ".").replace(" ", ""))
-            except ValueError:
-                pass
+            return None
+    return None
+
 
+def _find_price(node) -> float | None:
+    if isinstance(node, list):
+        for child in node:
+            price = _find_price(child)
+            if price is not None:
+                return price
+    elif isinstance(node, dict):
+        for key in ("price", "lowPrice"):
+            price = _parse_price(node.get(key))
+            if price is not None:
+                return price
+        for key in ("offers", "@graph", "mainEntity"):
+            price = _find_price(node.get(key))
+            if price is not None:
+                return price
     return None
+
+
+def _jsonld_price(text: str) -> float | None:
+    try:
+        data = json.loads(text, strict=False)
+    except ValueError:
+        return None
+    return _find_price(data)
+
+
+def normalize_url(url: str) -> str:
+    """Cache key for url: no fragment, no tracking params, sorted query, lowercase host."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), "")
+    )
+
+
+async def scrape_url(url: str) -> AutofillResponse:
+    key = normalize_url(url)
+    cached = autofill_cache.get(key)
+    if cached is not None:
+        return cached
+
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(_scrape_and_cache(url, key))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # Shielded so one caller disconnecting does not cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
+async def _scrape_and_cache(url: str, key: str) -> AutofillResponse:
+    extractor = PageExtractor()
+    started = time.perf_counter()
+    try:
+        async with aclosing(stream_text(url)) as chunks:
+            async for chunk in chunks:
+                extractor.feed(chunk)
+                if extractor.complete:
+                    break
+    except FetchError:
+        scraper_fetch_duration.labels("error").observe(time.perf_counter() - started)
+        response = AutofillResponse()
+        autofill_cache.set(key, response, ttl=settings.AUTOFILL_NEGATIVE_CACHE_TTL_SECONDS)
+        return response
+
+    scraper_fetch_duration.labels("ok").observe(time.perf_counter() - started)
+    response = extractor.result()
+    autofill_cache.set(key, response)
+    return response
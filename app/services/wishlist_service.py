@@ -1,12 +1,16 @@
 import re
 import secrets
 import uuid
+from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import and_, func, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.core.cache import invalidate_public_wishlist
+from app.core.pagination import PageParams
+from app.db.errors import is_foreign_key_violation
 from app.models.item import Item
 from app.models.wishlist import Wishlist
 from app.schemas.wishlist import WishlistCreate, WishlistUpdate
@@ -20,14 +24,31 @@ def _generate_slug(title: str) -> str:
     return f"{base}-{suffix}"
 
 
-async def get_user_wishlists(db: AsyncSession, user_id: uuid.UUID) -> list[Wishlist]:
-    result = await db.execute(
-        select(Wishlist)
-        .options(selectinload(Wishlist.items).selectinload(Item.reservations))
+async def get_user_wishlists(
+    db: AsyncSession, user_id: uuid.UUID, page: PageParams | None = None
+) -> list[tuple[Wishlist, int, int]]:
+    """Returns (wishlist, items_count, reserved_count) rows, counting only live items.
+
+    Newest first; a page is keyed on (created_at, id) and holds up to `page.limit + 1` rows.
+    """
+    stmt = (
+        select(
+            Wishlist,
+            func.count(Item.id).label("items_count"),
+            func.count(Item.id).filter(Item.reservation_count > 0).label("reserved_count"),
+        )
+        .outerjoin(Item, and_(Item.wishlist_id == Wishlist.id, Item.is_deleted.is_(False)))
         .where(Wishlist.user_id == user_id)
-        .order_by(Wishlist.created_at.desc())
+        .group_by(Wishlist.id)
+        .order_by(Wishlist.created_at.desc(), Wishlist.id.desc())
     )
-    return list(result.scalars().all())
+    if page is not None and page.enabled:
+        after = page.after(datetime, uuid.UUID)
+        if after is not None:
+            stmt = stmt.where(tuple_(Wishlist.created_at, Wishlist.id) < after)
+        stmt = stmt.limit(page.limit + 1)
+    result = await db.execute(stmt)
+    return [tuple(row) for row in result.all()]
 
 
 async def create_wishlist(db: AsyncSession, user_id: uuid.UUID, data: WishlistCreate) -> Wishlist:
@@ -40,28 +61,21 @@ async def create_wishlist(db: AsyncSession, user_id: uuid.UUID, data: WishlistCr
         event_date=data.event_date,
     )
     db.add(wishlist)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        # The token outlived its user
+        if is_foreign_key_violation(exc):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        raise
     await db.refresh(wishlist)
     return wishlist
 
 
 async def get_wishlist(db: AsyncSession, wishlist_id: uuid.UUID, user_id: uuid.UUID) -> Wishlist:
     result = await db.execute(
-        select(Wishlist)
-        .options(selectinload(Wishlist.items).selectinload(Item.reservations))
-        .where(Wishlist.id == wishlist_id, Wishlist.user_id == user_id)
-    )
-    wishlist = result.scalar_one_or_none()
-    if wishlist is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
-    return wishlist
-
-
-async def get_wishlist_by_slug(db: AsyncSession, slug: str) -> Wishlist:
-    result = await db.execute(
-        select(Wishlist)
-        .options(selectinload(Wishlist.items).selectinload(Item.reservations))
-        .where(Wishlist.slug == slug, Wishlist.is_public.is_(True))
+        select(Wishlist).where(Wishlist.id == wishlist_id, Wishlist.user_id == user_id)
     )
     wishlist = result.scalar_one_or_none()
     if wishlist is None:
@@ -77,6 +91,7 @@ async def update_wishlist(
     for key, value in update_data.items():
         setattr(wishlist, key, value)
     await db.commit()
+    invalidate_public_wishlist(wishlist.slug)
     await db.refresh(wishlist)
     return wishlist
 
@@ -85,3 +100,4 @@ async def delete_wishlist(db: AsyncSession, wishlist_id: uuid.UUID, user_id: uui
     wishlist = await get_wishlist(db, wishlist_id, user_id)
     await db.delete(wishlist)
     await db.commit()
+    invalidate_public_wishlist(wishlist.slug)
@@ -0,0 +1,97 @@
+"""Read models for the wishlist GET endpoints.
+
+Plain column selects mapped into NamedTuples: no identity map, no change tracking and only
+the columns the responses need. Soft-deleted items are filtered in SQL.
+"""
+import uuid
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+from decimal import Decimal
+from typing import NamedTuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.pagination import PageParams
+from app.models.item import Item
+from app.models.wishlist import Wishlist
+
+
+class WishlistView(NamedTuple):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    title: str
+    description: str | None
+    slug: str
+    is_public: bool
+    event_date: date | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class ItemView(NamedTuple):
+    id: uuid.UUID
+    title: str
+    description: str | None
+    url: str | None
+    price: Decimal
+    currency: str
+    image_url: str | None
+    position: int
+    reserved_amount: Decimal
+    reservation_count: int
+
+
+_wishlist_columns = [getattr(Wishlist, name) for name in WishlistView._fields]
+_item_columns = [getattr(Item, name) for name in ItemView._fields]
+
+
+async def _get_wishlist_view(db: AsyncSession, *criteria) -> WishlistView:
+    result = await db.execute(select(*_wishlist_columns).where(*criteria))
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+    return WishlistView(*row)
+
+
+async def get_public_wishlist(db: AsyncSession, slug: str) -> WishlistView:
+    return await _get_wishlist_view(db, Wishlist.slug == slug, Wishlist.is_public.is_(True))
+
+
+async def get_owner_wishlist(
+    db: AsyncSession, wishlist_id: uuid.UUID, user_id: uuid.UUID
+) -> WishlistView:
+    return await _get_wishlist_view(db, Wishlist.id == wishlist_id, Wishlist.user_id == user_id)
+
+
+def _items_query(wishlist_id: uuid.UUID):
+    return (
+        select(*_item_columns)
+        .where(Item.wishlist_id == wishlist_id, Item.is_deleted.is_(False))
+        .order_by(Item.position, Item.id)
+    )
+
+
+async def get_items(
+    db: AsyncSession, wishlist_id: uuid.UUID, page: PageParams | None = None
+) -> list[ItemView]:
+    """Live items in (position, id) order; with a page, up to `page.limit + 1` of them."""
+    stmt = _items_query(wishlist_id)
+    if page is not None and page.enabled:
+        after = page.after(int, uuid.UUID)
+        if after is not None:
+            stmt = stmt.where(tuple_(Item.position, Item.id) > after)
+        stmt = stmt.limit(page.limit + 1)
+    result = await db.execute(stmt)
+    return [ItemView(*row) for row in result]
+
+
+async def stream_items(db: AsyncSession, wishlist_id: uuid.UUID) -> AsyncIterator[list[ItemView]]:
+    """Yields batches of live items from a server-side cursor, so memory stays bounded."""
+    result = await db.stream(
+        _items_query(wishlist_id).execution_options(yield_per=settings.NDJSON_STREAM_BATCH_SIZE)
+    )
+    async for rows in result.partitions():
+        yield [ItemView(*row) for row in rows]
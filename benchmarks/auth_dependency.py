@@ -0,0 +1,81 @@
+"""Microbenchmark of the auth dependencies the routes use, with and without the caches.
+
+"user_id" is the token-only get_current_user_id, "optional" get_current_user_optional (the
+identity cache) and "user" get_current_user (a full User row).
+
+Needs the database from DATABASE_URL with migrations applied:
+
+    python -m benchmarks.auth_dependency --iterations 2000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.dependencies import (
+    get_current_user,
+    get_current_user_id,
+    get_current_user_optional,
+    user_identity_cache,
+)
+from app.core.security import access_claims_cache, create_access_token
+from app.db.database import async_session, engine
+from app.models.user import User
+
+
+def _clear_caches() -> None:
+    access_claims_cache.clear()
+    user_identity_cache.clear()
+
+
+async def _resolve(mode: str, credentials: HTTPAuthorizationCredentials, db) -> None:
+    if mode == "optional":
+        await get_current_user_optional(credentials, db)
+        return
+    user_id = await get_current_user_id(credentials)
+    if mode == "user":
+        await get_current_user(user_id, db)
+
+
+async def _run(mode: str, cached: bool, credentials, iterations: int) -> float:
+    _clear_caches()
+    async with async_session() as db:
+        await _resolve(mode, credentials, db)  # warm up the connection
+        started = time.perf_counter()
+        for _ in range(iterations):
+            if not cached:
+                _clear_caches()
+            await _resolve(mode, credentials, db)
+        return time.perf_counter() - started
+
+
+async def main(iterations: int) -> None:
+    async with async_session() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="x")
+        db.add(user)
+        await db.commit()
+
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=create_access_token(str(user.id))
+    )
+    try:
+        print(f"{'dependency':<24}{'caches':<8}{'us/call':>10}")
+        for mode in ("user_id", "optional", "user"):
+            for cached in (False, True):
+                elapsed = await _run(mode, cached, credentials, iterations)
+                label = "on" if cached else "off"
+                print(f"{mode:<24}{label:<8}{elapsed / iterations * 1e6:>10.1f}")
+    finally:
+        async with async_session() as db:
+            await db.delete(await db.get(User, user.id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
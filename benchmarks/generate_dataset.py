@@ -0,0 +1,230 @@
+"""Synthetic production-shaped dataset for benchmarking and tuning.
+
+Loads users -> wishlists -> items -> reservations into the database from DATABASE_URL with
+binary COPY, a chunk of users at a time so memory stays flat. The shape is heavy-tailed:
+most users have a few wishlists and most lists a few dozen items, but some lists run into the
+thousands and some items collect hundreds of partial reservations. A share of items is
+soft-deleted. Item aggregates (reserved_amount, reservation_count) match the reservations.
+
+Every chunk draws from its own generator seeded with (--seed, chunk number), so the same
+--seed and --chunk-users give the same rows, ids included, however many --workers load them.
+Workers are processes with a connection each, taking every Nth chunk. Every user gets the same
+password hash, computed once (bcrypt with a salt derived from the seed), so they can all log
+in with --password. Rows are consistent by construction, so --skip-fk-checks (superuser only)
+can switch off the foreign key triggers for the load.
+
+    python -m benchmarks.generate_dataset --users 100000 --seed 42 --workers 8
+    python -m benchmarks.generate_dataset --users 1000 --truncate   # wipe the four tables first
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import asyncpg
+import bcrypt
+
+from app.core.config import settings
+
+_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_BCRYPT_ALPHABET = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+_COLUMNS = {
+    "users": ("id", "email", "password_hash", "full_name", "created_at", "updated_at"),
+    "wishlists": (
+        "id", "user_id", "title", "description", "slug", "is_public", "event_date",
+        "created_at", "updated_at",
+    ),
+    "items": (
+        "id", "wishlist_id", "title", "description", "url", "price", "currency", "image_url",
+        "position", "is_deleted", "reserved_amount", "reservation_count", "created_at",
+        "updated_at",
+    ),
+    "reservations": (
+        "id", "item_id", "user_id", "guest_name", "guest_email", "amount",
+        "is_full_reservation", "message", "created_at", "updated_at",
+    ),
+}
+
+
+def _password_hash(password: str, rng: random.Random) -> str:
+    # bcrypt's own gensalt() is random; a seeded salt keeps the whole dataset reproducible
+    salt = "".join(rng.choice(_BCRYPT_ALPHABET) for _ in range(21)) + rng.choice(".Oeu")
+    prefix = f"$2b${settings.BCRYPT_ROUNDS:02d}$"
+    return bcrypt.hashpw(password.encode(), (prefix + salt).encode()).decode()
+
+
+class _Chunk:
+    """Rows for users [index * chunk_users, ...) and everything they own."""
+
+    def __init__(self, args, password_hash: str, index: int):
+        self.args = args
+        self.rng = random.Random(f"{args.seed}:{index}")
+        self.password_hash = password_hash
+        self.user_n = index * args.chunk_users
+        self.wishlist_n = 0
+        self.item_n = 0
+        self.gap = settings.ITEM_POSITION_GAP
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _moment(self, days: float = 365) -> datetime:
+        return _EPOCH + timedelta(seconds=self.rng.random() * days * 86400)
+
+    def _heavy_tail(self, mean: float, cap: int) -> int:
+        # Pareto(alpha=1.7) has mean alpha / (alpha - 1); scale it to the requested mean
+        return min(cap, int(mean / 2.43 * self.rng.paretovariate(1.7)))
+
+    def rows(self, n_users: int) -> dict[str, list[tuple]]:
+        args, rng = self.args, self.rng
+        rows: dict[str, list[tuple]] = {table: [] for table in _COLUMNS}
+        users, wishlists, items, reservations = (rows[t] for t in _COLUMNS)
+        user_ids = []
+
+        for _ in range(n_users):
+            self.user_n += 1
+            user_id = self._uuid()
+            created = self._moment()
+            user_ids.append(user_id)
+            users.append((
+                user_id, f"seed{args.seed}-{self.user_n}@example.com", self.password_hash,
+                f"User {self.user_n}", created, created,
+            ))
+
+            n_wishlists = 1 + int(rng.expovariate(1 / max(args.wishlists_per_user - 1, 1e-9)))
+            for _ in range(n_wishlists):
+                self.wishlist_n += 1
+                wishlist_id = self._uuid()
+                w_created = created + timedelta(days=rng.random() * 60)
+                wishlists.append((
+                    wishlist_id, user_id, f"Wishlist {self.wishlist_n}",
+                    "Birthday ideas" if rng.random() < 0.5 else None,
+                    f"seed{args.seed}-{self.user_n}-{self.wishlist_n}", rng.random() < 0.9,
+                    date(2026, 1, 1) + timedelta(days=rng.randrange(365)) if rng.random() < 0.6 else None,
+                    w_created, w_created,
+                ))
+                self._items(wishlist_id, w_created, user_ids, items, reservations)
+        return rows
+
+    def _items(self, wishlist_id, created, user_ids, items, reservations) -> None:
+        args, rng = self.args, self.rng
+        for position in range(self._heavy_tail(args.items_per_wishlist, args.max_items)):
+            item_id = self._uuid()
+            deleted = rng.random() < args.deleted_share
+            n_res = 0
+            if not deleted and rng.random() < args.reserved_share:
+                n_res = max(1, self._heavy_tail(args.reservations_per_item, args.max_reservations))
+
+            # Every contribution keeps the min(10% of price, 100) rule
+            per_share = rng.choice((100, 150, 250, 500, 1000))
+            price_cents = max(rng.randrange(50_000, 5_000_000), math.ceil(n_res * per_share * 100 / 0.9))
+            reserved_cents = 0
+            i_created = created + timedelta(hours=rng.random() * 240)
+            for _ in range(n_res):
+                amount_cents = per_share * 100
+                reserved_cents += amount_cents
+                # The owner is the last of user_ids and cannot reserve their own items;
+                # the chunk's first user has nobody else to reserve for them but guests
+                guest = rng.random() < 0.4 or len(user_ids) == 1
+                user_id = None if guest else user_ids[rng.randrange(len(user_ids) - 1)]
+                r_created = i_created + timedelta(hours=rng.random() * 2000)
+                reservations.append((
+                    self._uuid(), item_id, user_id,
+                    "Guest" if guest else None, None, Decimal(amount_cents).scaleb(-2), False,
+                    None, r_created, r_created,
+                ))
+            self.item_n += 1
+            n = f"{self.user_n}-{self.item_n}"
+            items.append((
+                item_id, wishlist_id, f"Item {position}",
+                "Nice to have" if rng.random() < 0.3 else None,
+                f"https://shop.example.com/p/{n}", Decimal(price_cents).scaleb(-2), "RUB",
+                f"https://cdn.example.com/{n}.jpg" if rng.random() < 0.7 else None,
+                position * self.gap, deleted, Decimal(reserved_cents).scaleb(-2), n_res,
+                i_created, i_created,
+            ))
+
+
+async def _connect(args) -> asyncpg.Connection:
+    dsn = settings.database_url_async.replace("postgresql+asyncpg://", "postgresql://", 1)
+    conn = await asyncpg.connect(dsn)
+    await conn.execute("SET synchronous_commit = off")
+    if args.skip_fk_checks:
+        await conn.execute("SET session_replication_role = replica")
+    return conn
+
+
+async def _load(args, password_hash: str, worker: int) -> dict[str, int]:
+    conn = await _connect(args)
+    totals = dict.fromkeys(_COLUMNS, 0)
+    n_chunks = math.ceil(args.users / args.chunk_users)
+    try:
+        for index in range(worker, n_chunks, args.workers):
+            n_users = min(args.chunk_users, args.users - index * args.chunk_users)
+            rows = _Chunk(args, password_hash, index).rows(n_users)
+            async with conn.transaction():
+                for table, records in rows.items():
+                    await conn.copy_records_to_table(table, records=records, columns=_COLUMNS[table])
+                    totals[table] += len(records)
+            print(f"worker {worker}: chunk {index + 1}/{n_chunks}  {sum(totals.values())} rows", flush=True)
+    finally:
+        await conn.close()
+    return totals
+
+
+def _load_in_process(args, password_hash: str, worker: int) -> dict[str, int]:
+    return asyncio.run(_load(args, password_hash, worker))
+
+
+async def main(args) -> None:
+    conn = await _connect(args)
+    try:
+        if args.truncate:
+            await conn.execute("TRUNCATE reservations, items, wishlists, users")
+
+        started = time.perf_counter()
+        password_hash = _password_hash(args.password, random.Random(args.seed))
+        if args.workers == 1:
+            results = [await _load(args, password_hash, 0)]
+        else:
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(args.workers) as pool:
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(pool, _load_in_process, args, password_hash, worker)
+                    for worker in range(args.workers)
+                ))
+        elapsed = time.perf_counter() - started
+        await conn.execute("ANALYZE users, wishlists, items, reservations")
+    finally:
+        await conn.close()
+
+    totals = {table: sum(result[table] for result in results) for table in _COLUMNS}
+    loaded = sum(totals.values())
+    print("  ".join(f"{table}={n}" for table, n in totals.items()))
+    print(f"{loaded} rows in {elapsed:.1f}s ({loaded / elapsed:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--wishlists-per-user", type=float, default=3, help="mean")
+    parser.add_argument("--items-per-wishlist", type=float, default=40, help="mean, heavy-tailed")
+    parser.add_argument("--max-items", type=int, default=5_000)
+    parser.add_argument("--reserved-share", type=float, default=0.4, help="items with reservations")
+    parser.add_argument("--reservations-per-item", type=float, default=4, help="mean when reserved")
+    parser.add_argument("--max-reservations", type=int, default=500)
+    parser.add_argument("--deleted-share", type=float, default=0.08)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--chunk-users", type=int, default=1_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--skip-fk-checks", action="store_true", help="needs a superuser")
+    parser.add_argument("--truncate", action="store_true", help="empty the four tables first")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,292 @@
+"""End-to-end HTTP load suite for the API.
+
+Drives app.main:app in-process through ASGI (default) or a running server (--base-url) against
+the database from DATABASE_URL, with migrations applied. Scenarios:
+
+  public_view        anonymous GET /api/w/{slug}; half of the requests revalidate with ETag
+  owner_dashboard    owner GET /api/wishlists, every fourth request opens one wishlist
+  reservation_burst  concurrent POST /api/items/{id}/reserve on one item until it fills up
+  login_storm        POST /api/auth/login across a pool of users
+
+Reports p50/p95/p99 latency, throughput and (in-process only) SQL statements per request, and
+writes everything to JSON so runs can be compared across commits. Needs httpx:
+
+    python -m benchmarks.load --requests 2000 --concurrency 32
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 --scenarios public_view login_storm
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import event, text
+
+from app.core.config import settings
+from app.db.database import async_session, engine
+
+_PASSWORD = "load-password"
+# The minimum contribution is min(10% of price, 100)
+_BURST_AMOUNT = 100
+
+
+class _QueryCounter:
+    """Counts statements sent by the in-process engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def _register(client: httpx.AsyncClient, email: str) -> dict:
+    r = await client.post("/api/auth/register", json={"email": email, "password": _PASSWORD})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def _prepare(client: httpx.AsyncClient, run_id: str, args) -> dict:
+    owner = await _register(client, f"load-{run_id}-owner@example.com")
+    wishlists = []
+    for i in range(args.owner_wishlists):
+        r = await client.post("/api/wishlists", json={"title": f"Load {i}"}, headers=owner)
+        r.raise_for_status()
+        wishlists.append(r.json())
+    showcase = wishlists[0]
+    rows = [
+        {
+            "title": f"Gift {i}",
+            "description": "Something nice",
+            "url": f"https://shop.example.com/p/{i}",
+            "price": 1000 + i,
+        }
+        for i in range(args.items)
+    ]
+    r = await client.post(f"/api/wishlists/{showcase['id']}/items/import", json=rows, headers=owner)
+    r.raise_for_status()
+
+    # Room for half of the burst, so the run covers both accepted and rejected reservations
+    burst_price = max(1, args.requests // 2) * _BURST_AMOUNT
+    r = await client.post(
+        f"/api/wishlists/{wishlists[-1]['id']}/items",
+        json={"title": "Burst", "price": burst_price},
+        headers=owner,
+    )
+    r.raise_for_status()
+
+    emails = [f"load-{run_id}-user{i}@example.com" for i in range(args.login_users)]
+    await asyncio.gather(*(_register(client, email) for email in emails))
+    return {
+        "owner": owner,
+        "wishlist_id": showcase["id"],
+        "slug": showcase["slug"],
+        "burst_item_id": r.json()["id"],
+        "emails": emails,
+        "etags": {},
+    }
+
+
+async def _public_view(client, state, worker: int, rng: random.Random) -> int:
+    headers = {}
+    etag = state["etags"].get(worker)
+    if etag and rng.random() < 0.5:
+        headers["If-None-Match"] = etag
+    r = await client.get(f"/api/w/{state['slug']}", headers=headers)
+    if "etag" in r.headers:
+        state["etags"][worker] = r.headers["etag"]
+    return r.status_code
+
+
+async def _owner_dashboard(client, state, worker: int, rng: random.Random) -> int:
+    if rng.random() < 0.25:
+        r = await client.get(f"/api/wishlists/{state['wishlist_id']}", headers=state["owner"])
+    else:
+        r = await client.get("/api/wishlists", headers=state["owner"])
+    return r.status_code
+
+
+async def _reservation_burst(client, state, worker: int, rng: random.Random) -> int:
+    r = await client.post(
+        f"/api/items/{state['burst_item_id']}/reserve",
+        json={"amount": _BURST_AMOUNT, "guest_name": f"Guest {worker}"},
+    )
+    return r.status_code
+
+
+async def _login_storm(client, state, worker: int, rng: random.Random) -> int:
+    email = rng.choice(state["emails"])
+    r = await client.post("/api/auth/login", json={"email": email, "password": _PASSWORD})
+    return r.status_code
+
+
+SCENARIOS = {
+    "public_view": _public_view,
+    "owner_dashboard": _owner_dashboard,
+    "reservation_burst": _reservation_burst,
+    "login_storm": _login_storm,
+}
+
+
+def _percentiles(latencies: list[float]) -> dict:
+    ms = sorted(latency * 1e3 for latency in latencies)
+    if len(ms) < 2:
+        ms = ms * 2 or [0.0, 0.0]
+    cuts = statistics.quantiles(ms, n=100, method="inclusive")
+    return {
+        "p50": round(cuts[49], 3),
+        "p95": round(cuts[94], 3),
+        "p99": round(cuts[98], 3),
+        "mean": round(statistics.fmean(ms), 3),
+        "max": round(ms[-1], 3),
+    }
+
+
+async def _run_scenario(name, client, state, args, queries: _QueryCounter | None) -> dict:
+    call = SCENARIOS[name]
+    rng = random.Random(args.seed)
+    for i in range(args.warmup):
+        await call(client, state, i % args.concurrency, rng)
+
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    tickets = itertools.count()
+    queries_before = queries.count if queries else 0
+
+    async def worker(index: int) -> None:
+        worker_rng = random.Random(args.seed * 1000 + index)
+        while next(tickets) < args.requests:
+            started = time.perf_counter()
+            try:
+                status = str(await call(client, state, index, worker_rng))
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    errors = sum(n for status, n in statuses.items() if not status.isdigit() or int(status) >= 500)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": dict(sorted(statuses.items())),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": _percentiles(latencies),
+        "queries_per_request": (
+            round((queries.count - queries_before) / len(latencies), 2) if queries else None
+        ),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+async def _cleanup(run_id: str) -> None:
+    async with async_session() as db:
+        await db.execute(
+            text("DELETE FROM users WHERE email LIKE :pattern"), {"pattern": f"load-{run_id}-%"}
+        )
+        await db.commit()
+
+
+async def main(args) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    started_at = datetime.now(timezone.utc).isoformat()
+    queries = None
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+        target = args.base_url
+    else:
+        from app.main import app
+
+        queries = _QueryCounter()
+        event.listen(engine.sync_engine, "before_cursor_execute", queries)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=30
+        )
+        target = "asgi"
+
+    results = {}
+    try:
+        async with client:
+            state = await _prepare(client, run_id, args)
+            for name in args.scenarios:
+                results[name] = await _run_scenario(name, client, state, args, queries)
+                _print_row(name, results[name])
+    finally:
+        await _cleanup(run_id)
+        await engine.dispose()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": started_at,
+            "target": target,
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "items": args.items,
+            "seed": args.seed,
+            "settings": {
+                "BCRYPT_ROUNDS": settings.BCRYPT_ROUNDS,
+                "PASSWORD_HASH_WORKERS": settings.PASSWORD_HASH_WORKERS,
+                "PUBLIC_WISHLIST_CACHE_TTL_SECONDS": settings.PUBLIC_WISHLIST_CACHE_TTL_SECONDS,
+                "replicas": len(settings.database_replica_urls_async),
+            },
+        },
+        "scenarios": results,
+    }
+    output = Path(args.output or f"benchmarks/results/load-{report['meta']['commit']}-{run_id}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nwrote {output}")
+
+
+def _print_row(name: str, result: dict) -> None:
+    latency = result["latency_ms"]
+    qpr = result["queries_per_request"]
+    print(
+        f"{name:<19}{result['requests']:>7}{result['throughput_rps']:>9.1f}"
+        f"{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}"
+        f"{'-' if qpr is None else qpr:>8}{result['errors']:>7}  {result['statuses']}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", help="load a running server instead of the in-process app")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=1000, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--items", type=int, default=200, help="items in the viewed wishlist")
+    parser.add_argument("--owner-wishlists", type=int, default=10)
+    parser.add_argument("--login-users", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON path (default benchmarks/results/load-<commit>-<run>.json)")
+    args = parser.parse_args()
+    print(
+        f"{'scenario':<19}{'reqs':>7}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'q/req':>8}{'errs':>7}  statuses"
+    )
+    asyncio.run(main(args))
@@ -0,0 +1,168 @@
+"""Throughput of contributions from N concurrent clients to one hot item.
+
+Compares the single-statement reservation insert with the previous
+SELECT ... FOR UPDATE flow, copied from the service as it was before the
+switch (only the cache invalidation call is today's). Needs the database from DATABASE_URL with
+migrations applied:
+
+    python -m benchmarks.reservation_contention --concurrency 1 8 32 --contributions 2000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from decimal import Decimal
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app.core.cache import invalidate_public_wishlist
+from app.core.config import settings
+from app.core.security import CurrentUser
+from app.models import Item, Reservation, User, Wishlist
+from app.schemas.reservation import ReservationCreate
+from app.services import reservation_service
+
+
+async def _legacy_adjust_item_aggregates(
+    db, item_id: uuid.UUID, amount_delta: Decimal, count_delta: int
+) -> str:
+    result = await db.execute(
+        update(Item)
+        .where(Item.id == item_id, Item.wishlist_id == Wishlist.id)
+        .values(
+            reserved_amount=Item.reserved_amount + amount_delta,
+            reservation_count=Item.reservation_count + count_delta,
+        )
+        .returning(Wishlist.slug)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one()
+
+
+async def _legacy_create_reservation(
+    db, item_id: uuid.UUID, data: ReservationCreate, user: CurrentUser | None = None
+) -> Reservation:
+    """create_reservation as it was before the CTE insert (48a3c9d^), statement for statement."""
+    # Lock the item row to prevent race conditions
+    result = await db.execute(
+        select(Item)
+        .options(selectinload(Item.wishlist))
+        .where(Item.id == item_id, Item.is_deleted.is_(False))
+        .with_for_update()
+    )
+    item = result.scalar_one_or_none()
+    if item is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+
+    # Owner cannot reserve their own items
+    if user and item.wishlist.user_id == user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot reserve your own item")
+
+    # Guest must provide name
+    if user is None and not data.guest_name:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Guest name is required")
+
+    reserved_total = item.reserved_amount
+    remaining = Decimal(str(item.price)) - reserved_total
+
+    if remaining <= 0:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Item is fully reserved")
+
+    amount = Decimal(str(data.amount))
+
+    if data.is_full_reservation:
+        if reserved_total > 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Cannot fully reserve — partial contributions exist",
+            )
+        amount = Decimal(str(item.price))
+    else:
+        # Validate minimum contribution: min(10% of price, 100 RUB)
+        min_amount = min(Decimal(str(item.price)) * Decimal("0.1"), Decimal("100"))
+        if amount < min_amount:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Minimum contribution is {min_amount}",
+            )
+        if amount > remaining:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Maximum contribution is {remaining}",
+            )
+
+    reservation = Reservation(
+        item_id=item_id,
+        user_id=user.id if user else None,
+        guest_name=data.guest_name if user is None else None,
+        guest_email=data.guest_email if user is None else None,
+        amount=amount,
+        is_full_reservation=data.is_full_reservation,
+        message=data.message,
+    )
+    db.add(reservation)
+    slug = await _legacy_adjust_item_aggregates(db, item_id, amount, 1)
+    await db.commit()
+    invalidate_public_wishlist(slug)
+    await db.refresh(reservation)
+    return reservation
+
+
+async def _run(mode: str, concurrency: int, contributions: int) -> float:
+    engine = create_async_engine(
+        settings.database_url_async, pool_size=concurrency, max_overflow=0
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as db:
+        owner = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="x")
+        db.add(owner)
+        await db.flush()
+        wishlist = Wishlist(user_id=owner.id, title="bench", slug=f"bench-{uuid.uuid4().hex}")
+        db.add(wishlist)
+        await db.flush()
+        item = Item(wishlist_id=wishlist.id, title="hot item", price=Decimal("99999999"))
+        db.add(item)
+        await db.commit()
+
+    data = ReservationCreate(amount=100, guest_name="bench")
+    remaining = contributions
+
+    async def worker() -> None:
+        nonlocal remaining
+        async with session_factory() as db:
+            while remaining > 0:
+                remaining -= 1
+                if mode == "legacy":
+                    await _legacy_create_reservation(db, item.id, data)
+                else:
+                    await reservation_service.create_reservation(db, item.id, data)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as db:
+        await db.execute(delete(User).where(User.id == owner.id))
+        await db.commit()
+    await engine.dispose()
+    return contributions / elapsed
+
+
+async def main(concurrency_levels: list[int], contributions: int) -> None:
+    print(f"{'mode':<10}{'clients':>8}{'reservations/s':>16}")
+    for concurrency in concurrency_levels:
+        for mode in ("legacy", "cte"):
+            throughput = await _run(mode, concurrency, contributions)
+            print(f"{mode:<10}{concurrency:>8}{throughput:>16.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--contributions", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.contributions))
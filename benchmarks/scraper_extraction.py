@@ -0,0 +1,108 @@
+"""Compares the streaming PageExtractor with the previous BeautifulSoup path.
+
+Each page in benchmarks/corpus is padded at its FILLER marker with product-page
+markup up to --size-kb, then parsed both ways. The BeautifulSoup reference
+needs beautifulsoup4, which is no longer an app dependency:
+
+    pip install beautifulsoup4
+    python -m benchmarks.scraper_extraction --size-kb 2048 --repeat 5
+"""
+import argparse
+import re
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.services.scraper_service import PageExtractor
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+CHUNK_SIZE = 64 * 1024
+FILLER_BLOCK = (
+    '<div class="review"><div class="author">Покупатель</div>'
+    '<div class="rating" data-score="5"></div>'
+    "<p>Отличный товар, пришёл быстро, упаковка целая. Рекомендую!</p>"
+    '<ul class="tags"><li>качество</li><li>доставка</li><li>цена</li></ul></div>\n'
+)
+
+
+def _soup_extract(html: str) -> dict:
+    """The BeautifulSoup implementation scraper_service used before the streaming extractor."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    def get_meta(name):
+        tag = soup.find("meta", attrs={"property": name}) or soup.find("meta", attrs={"name": name})
+        return tag.get("content") if tag else None
+
+    price = None
+    price_meta = get_meta("og:price:amount") or get_meta("product:price:amount")
+    if price_meta:
+        try:
+            price = float(price_meta.replace(",", ".").replace(" ", ""))
+        except ValueError:
+            pass
+    if price is None:
+        for script in soup.find_all("script", type="application/ld+json"):
+            match = re.search(r'"price"\s*:\s*"?([\d.,\s]+)"?', script.get_text())
+            if match:
+                try:
+                    price = float(match.group(1).replace(",", ".").replace(" ", ""))
+                    break
+                except ValueError:
+                    pass
+
+    title_tag = soup.find("title")
+    return {
+        "title": get_meta("og:title") or (title_tag.get_text(strip=True) if title_tag else None),
+        "description": get_meta("og:description") or get_meta("description"),
+        "image_url": get_meta("og:image"),
+        "price": price,
+    }
+
+
+def _stream_extract(html: str) -> dict:
+    # What _scrape_and_cache does with the fetched chunks, minus the network
+    extractor = PageExtractor()
+    for i in range(0, len(html), CHUNK_SIZE):
+        extractor.feed(html[i:i + CHUNK_SIZE])
+        if extractor.complete:
+            break
+    return extractor.result().model_dump()
+
+
+def _load_page(path: Path, size_kb: int) -> str:
+    html = path.read_text(encoding="utf-8")
+    padding = max(0, size_kb * 1024 - len(html.encode()))
+    filler = FILLER_BLOCK * (padding // len(FILLER_BLOCK.encode()) + 1)
+    return html.replace("<!-- FILLER -->", filler, 1)
+
+
+def _measure(fn, html: str, repeat: int) -> tuple[float, float, dict]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(html)
+    elapsed = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main(size_kb: int, repeat: int) -> None:
+    print(f"{'page':<26}{'parser':<10}{'ms':>10}{'peak MiB':>12}  result")
+    for path in sorted(CORPUS_DIR.glob("*.html")):
+        html = _load_page(path, size_kb)
+        for label, fn in (("soup", _soup_extract), ("stream", _stream_extract)):
+            elapsed, peak, result = _measure(fn, html, repeat)
+            print(f"{path.stem:<26}{label:<10}{elapsed * 1000:>10.1f}{peak / 2**20:>12.2f}  {result}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-kb", type=int, default=2048)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.size_kb, args.repeat)
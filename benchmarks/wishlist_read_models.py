@@ -0,0 +1,112 @@
+"""Public wishlist load: ORM entities vs column-projected read models.
+
+"orm" is the previous path, kept here as it was (Wishlist + selectinload(items) as full ORM
+objects, soft-deleted items dropped in Python); "views" is app.services.wishlist_views. Both end in the same response
+record. Needs the database from DATABASE_URL with migrations applied; the wishlist is created
+and removed by the benchmark:
+
+    python -m benchmarks.wishlist_read_models --items 500 --iterations 200
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+from app.api.endpoints.wishlists import _wishlist_record
+from app.db.database import async_session, engine
+from app.models.item import Item
+from app.models.user import User
+from app.models.wishlist import Wishlist
+from app.services import wishlist_views
+
+
+async def _orm(db, slug: str) -> dict:
+    result = await db.execute(
+        select(Wishlist)
+        .options(selectinload(Wishlist.items))
+        .where(Wishlist.slug == slug, Wishlist.is_public.is_(True))
+    )
+    wishlist = result.scalar_one()
+    items = sorted((item for item in wishlist.items if not item.is_deleted), key=lambda i: i.position)
+    return _wishlist_record(wishlist, items)
+
+
+async def _views(db, slug: str) -> dict:
+    wishlist = await wishlist_views.get_public_wishlist(db, slug)
+    return _wishlist_record(wishlist, await wishlist_views.get_items(db, wishlist.id))
+
+
+async def _seed(n_items: int) -> tuple[uuid.UUID, str]:
+    async with async_session() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="x")
+        wishlist = Wishlist(user=user, title="Benchmark", slug=f"bench-{uuid.uuid4().hex[:12]}")
+        db.add(wishlist)
+        await db.flush()
+        await db.execute(
+            insert(Item),
+            [
+                {
+                    "wishlist_id": wishlist.id,
+                    "title": f"Item {i}",
+                    "description": "A reasonably sized description of the gift",
+                    "url": f"https://shop.example.com/products/{i}",
+                    "price": Decimal("1999.90"),
+                    "currency": "RUB",
+                    "image_url": f"https://cdn.example.com/{i}.jpg",
+                    "position": i,
+                    # A tenth of the rows are soft-deleted, like a list that has been edited
+                    "is_deleted": i % 10 == 0,
+                }
+                for i in range(n_items)
+            ],
+        )
+        await db.commit()
+        return user.id, wishlist.slug
+
+
+async def _measure(load, slug: str, iterations: int) -> tuple[float, int, int]:
+    async with async_session() as db:
+        await load(db, slug)  # warm up the connection and statement cache
+
+    elapsed = 0.0
+    for _ in range(iterations):
+        async with async_session() as db:
+            started = time.perf_counter()
+            await load(db, slug)
+            elapsed += time.perf_counter() - started
+
+    async with async_session() as db:
+        tracemalloc.start()
+        await load(db, slug)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    return elapsed / iterations, peak, blocks
+
+
+async def main(n_items: int, iterations: int) -> None:
+    user_id, slug = await _seed(n_items)
+    try:
+        print(f"{'path':<8}{'ms/load':>10}{'peak KiB':>12}{'live blocks':>14}")
+        for name, load in (("orm", _orm), ("views", _views)):
+            elapsed, peak, blocks = await _measure(load, slug, iterations)
+            print(f"{name:<8}{elapsed * 1e3:>10.2f}{peak / 1024:>12.0f}{blocks:>14}")
+    finally:
+        async with async_session() as db:
+            await db.delete(await db.get(User, user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.iterations))
@@ -0,0 +1,131 @@
+"""Serialization cost of the wishlist endpoints: Pydantic models vs one-pass records.
+
+"models" is the previous handler path: build ItemInWishlist/WishlistWithItemsResponse by hand,
+then let FastAPI validate them against response_model and JSON-encode the result. "json" and
+"msgpack" are the current path (plain dicts encoded by app.core.serialization). No database is
+needed, the wishlist is built in memory:
+
+    python -m benchmarks.wishlist_serialization --items 50 500 5000
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.api.endpoints.wishlists import _wishlist_record
+from app.core.serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, encode
+from app.schemas.wishlist import ItemInWishlist, WishlistWithItemsResponse
+
+_response_adapter = TypeAdapter(WishlistWithItemsResponse)
+
+
+def _make_wishlist(n_items: int) -> SimpleNamespace:
+    now = datetime.now(timezone.utc)
+    items = [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            title=f"Item {i}",
+            description="A reasonably sized description of the gift" if i % 2 else None,
+            url=f"https://shop.example.com/products/{i}",
+            price=Decimal("1999.90"),
+            currency="RUB",
+            image_url=f"https://cdn.example.com/{i}.jpg",
+            position=i,
+            is_deleted=False,
+            reserved_amount=Decimal("500.00") if i % 3 else Decimal("0"),
+            reservation_count=i % 3,
+        )
+        for i in range(n_items)
+    ]
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        title="Birthday",
+        description=None,
+        slug="birthday-abc123",
+        is_public=True,
+        event_date=date(2026, 12, 31),
+        created_at=now,
+        updated_at=now,
+        items=items,
+    )
+
+
+def _models(wishlist) -> bytes:
+    items = []
+    for item in wishlist.items:
+        reserved_amount = float(item.reserved_amount)
+        items.append(
+            ItemInWishlist(
+                id=item.id,
+                title=item.title,
+                description=item.description,
+                url=item.url,
+                price=float(item.price),
+                currency=item.currency,
+                image_url=item.image_url,
+                position=item.position,
+                reserved_amount=reserved_amount,
+                is_fully_reserved=reserved_amount >= float(item.price),
+                reservation_count=item.reservation_count,
+            )
+        )
+    items.sort(key=lambda i: i.position)
+    response = WishlistWithItemsResponse(
+        id=wishlist.id,
+        user_id=wishlist.user_id,
+        title=wishlist.title,
+        description=wishlist.description,
+        slug=wishlist.slug,
+        is_public=wishlist.is_public,
+        event_date=wishlist.event_date,
+        created_at=wishlist.created_at,
+        updated_at=wishlist.updated_at,
+        items=items,
+    )
+    # What FastAPI does with a returned model and a response_model, then JSONResponse.render
+    validated = _response_adapter.validate_python(response, from_attributes=True)
+    content = _response_adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _records(media_type: str):
+    return lambda wishlist: encode(_wishlist_record(wishlist, wishlist.items), media_type)
+
+
+def _time(fn, wishlist, iterations: int) -> tuple[float, int]:
+    body = fn(wishlist)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(wishlist)
+    return (time.perf_counter() - started) / iterations, len(body)
+
+
+def main(sizes: list[int], budget: float) -> None:
+    paths = {
+        "models": _models,
+        "json": _records(JSON_MEDIA_TYPE),
+        "msgpack": _records(MSGPACK_MEDIA_TYPE),
+    }
+    print(f"{'items':>6}  {'path':<9}{'ms/response':>12}{'bytes':>10}{'speedup':>9}")
+    for n_items in sizes:
+        wishlist = _make_wishlist(n_items)
+        iterations = max(3, int(budget / (n_items * 20e-6)))
+        baseline = None
+        for name, fn in paths.items():
+            elapsed, size = _time(fn, wishlist, iterations)
+            baseline = baseline or elapsed
+            print(f"{n_items:>6}  {name:<9}{elapsed * 1e3:>12.3f}{size:>10}{baseline / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--budget", type=float, default=1.0, help="rough seconds per measurement")
+    args = parser.parse_args()
+    main(args.items, args.budget)
@@ -0,0 +1,81 @@
+import uuid
+from decimal import Decimal
+from typing import NamedTuple
+
+import pytest
+from sqlalchemy import delete, text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.metrics import assert_max_queries
+from app.db.database import async_session, engine
+from app.models.item import Item
+from app.models.user import User
+from app.models.wishlist import Wishlist
+
+
+@pytest.fixture
+async def db():
+    """A session on the DATABASE_URL database with migrations applied; skips without one."""
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except (OSError, DBAPIError) as exc:
+        pytest.skip(f"database is not available: {exc}")
+    try:
+        async with async_session() as session:
+            yield session
+    finally:
+        # The pool's connections belong to this test's event loop
+        await engine.dispose()
+
+
+@pytest.fixture
+def query_budget(request):
+    """query_budget(n) fails the test when its block runs more than n SQL statements."""
+
+    def budget(limit: int, label: str | None = None):
+        return assert_max_queries(limit, label or request.node.name)
+
+    return budget
+
+
+_ITEM_DEFAULTS = {"title": "Gift", "price": Decimal("100")}
+
+
+class SeededWishlist(NamedTuple):
+    owner_id: uuid.UUID
+    wishlist_id: uuid.UUID
+    slug: str
+    item_ids: list[uuid.UUID]
+
+
+@pytest.fixture
+async def make_wishlist(db):
+    """make_wishlist(*items) seeds an owner and a public wishlist, one item per dict of fields.
+
+    Items default to a title and a price of 100; everything is deleted after the test.
+    """
+    owner_ids = []
+
+    async def make(*items: dict) -> SeededWishlist:
+        run = uuid.uuid4().hex[:8]
+        owner = User(id=uuid.uuid4(), email=f"test-{run}@example.com", password_hash="x")
+        wishlist = Wishlist(id=uuid.uuid4(), user_id=owner.id, title="Test", slug=f"test-{run}")
+        rows = [
+            Item(id=uuid.uuid4(), wishlist_id=wishlist.id, **{**_ITEM_DEFAULTS, **fields})
+            for fields in items
+        ]
+        owner_ids.append(owner.id)
+        db.add(owner)
+        await db.flush()
+        db.add(wishlist)
+        await db.flush()
+        db.add_all(rows)
+        await db.commit()
+        return SeededWishlist(owner.id, wishlist.id, wishlist.slug, [row.id for row in rows])
+
+    yield make
+    await db.rollback()
+    if owner_ids:
+        await db.execute(delete(User).where(User.id.in_(owner_ids)))
+        await db.commit()
@@ -0,0 +1,41 @@
+"""Register and a rehashing login send the user's next reads to the primary."""
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.security import decode_access_token
+from app.db.session import recent_user_writes
+from app.models.user import User
+from app.schemas.auth import LoginRequest, RegisterRequest
+from app.services import auth_service
+
+
+@pytest.fixture
+async def email(db):
+    email = f"writer-{uuid.uuid4().hex[:8]}@example.com"
+    yield email
+    await db.rollback()
+    await db.execute(delete(User).where(User.email == email))
+    await db.commit()
+
+
+async def test_register_marks_the_new_user_as_writer(db, email):
+    tokens = await auth_service.register(db, RegisterRequest(email=email, password="password123"))
+    user_id = decode_access_token(tokens.access_token)
+    assert recent_user_writes.get(user_id) is not None
+
+
+async def test_login_with_rehash_marks_the_user_as_writer(db, email, monkeypatch):
+    tokens = await auth_service.register(db, RegisterRequest(email=email, password="password123"))
+    user_id = decode_access_token(tokens.access_token)
+    recent_user_writes.clear()
+
+    monkeypatch.setattr(auth_service, "password_needs_rehash", lambda password_hash: False)
+    await auth_service.login(db, LoginRequest(email=email, password="password123"))
+    assert recent_user_writes.get(user_id) is None
+
+    monkeypatch.setattr(auth_service.settings, "PASSWORD_REHASH_ON_LOGIN", True)
+    monkeypatch.setattr(auth_service, "password_needs_rehash", lambda password_hash: True)
+    await auth_service.login(db, LoginRequest(email=email, password="password123"))
+    assert recent_user_writes.get(user_id) is not None
@@ -0,0 +1,125 @@
+"""Autofill fetching against a local stub HTTP server."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+
+from app.core.config import settings
+from app.core.http import FetchError, close_http_session, get_http_session, stream_text
+from app.schemas.item import AutofillResponse
+from app.services import scraper_service
+
+HEAD = (
+    "<html><head><title>Stub page</title>"
+    '<meta property="og:title" content="Desk lamp">'
+    '<meta property="og:description" content="A lamp for the desk">'
+    '<meta property="og:image" content="https://img.example.com/lamp.jpg">'
+    '<meta property="og:price:amount" content="1299.50">'
+    "</head><body>"
+)
+
+
+@pytest.fixture
+async def stub_server():
+    peers: set[int] = set()
+    release = asyncio.Event()
+
+    async def page(request):
+        peers.add(request.transport.get_extra_info("peername")[1])
+        return web.Response(text=HEAD + "<p>body</p></body></html>", content_type="text/html")
+
+    async def endless(request):
+        # The head arrives at once, the rest of the body never does
+        response = web.StreamResponse(headers={"Content-Type": "text/html"})
+        await response.prepare(request)
+        await response.write(HEAD.encode())
+        await release.wait()
+        return response
+
+    async def big(request):
+        return web.Response(body=b"x" * 100_000, content_type="text/plain")
+
+    async def stalled(request):
+        await release.wait()
+        return web.Response(text="too late")
+
+    async def missing(request):
+        raise web.HTTPNotFound()
+
+    app = web.Application()
+    app.add_routes([
+        web.get("/page", page),
+        web.get("/endless", endless),
+        web.get("/big", big),
+        web.get("/stalled", stalled),
+        web.get("/missing", missing),
+    ])
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    scraper_service.autofill_cache.clear()
+
+    yield SimpleNamespace(url=f"http://{host}:{port}", peers=peers)
+
+    release.set()
+    await close_http_session()
+    await runner.cleanup()
+
+
+async def _read(url: str, **kwargs) -> str:
+    return "".join([chunk async for chunk in stream_text(url, **kwargs)])
+
+
+async def test_connections_are_kept_alive_and_reused(stub_server):
+    for _ in range(3):
+        assert "Desk lamp" in await _read(f"{stub_server.url}/page")
+    assert len(stub_server.peers) == 1
+
+
+async def test_per_host_limit_queues_concurrent_requests(stub_server, monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_MAX_CONNECTIONS_PER_HOST", 1)
+    await close_http_session()
+    await asyncio.gather(*(_read(f"{stub_server.url}/page") for _ in range(4)))
+    assert len(stub_server.peers) == 1
+
+
+async def test_body_is_capped(stub_server):
+    assert len(await _read(f"{stub_server.url}/big", max_bytes=1000)) == 1000
+
+
+async def test_autofill_stops_reading_once_the_head_is_complete(stub_server):
+    started = time.perf_counter()
+    result = await asyncio.wait_for(scraper_service.scrape_url(f"{stub_server.url}/endless"), 5)
+    assert time.perf_counter() - started < 2
+    assert result == AutofillResponse(
+        title="Desk lamp",
+        description="A lamp for the desk",
+        image_url="https://img.example.com/lamp.jpg",
+        price=1299.5,
+    )
+
+
+async def test_read_timeout(stub_server, monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_READ_TIMEOUT", 0.2)
+    await close_http_session()
+    started = time.perf_counter()
+    with pytest.raises(FetchError):
+        await _read(f"{stub_server.url}/stalled")
+    assert time.perf_counter() - started < 2
+
+
+async def test_connect_and_read_timeouts_are_separate(stub_server):
+    timeout = get_http_session().timeout
+    assert timeout.sock_connect == settings.HTTP_CONNECT_TIMEOUT
+    assert timeout.sock_read == settings.HTTP_READ_TIMEOUT
+    assert timeout.total == settings.HTTP_TOTAL_TIMEOUT
+
+
+async def test_error_status_gives_an_empty_autofill(stub_server):
+    with pytest.raises(FetchError):
+        await _read(f"{stub_server.url}/missing")
+    assert await scraper_service.scrape_url(f"{stub_server.url}/missing") == AutofillResponse()
@@ -0,0 +1,100 @@
+"""Streaming JSON and CSV parsing for the item import, and where imported items land."""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.item import Item
+from app.services import item_service
+from app.services.item_import import iter_csv_rows, iter_json_rows
+
+
+async def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+async def _collect(rows) -> list:
+    return [row async for row in rows]
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+async def test_csv_rows_across_chunks(size):
+    body = (
+        'title,price,description\n'
+        '32" TV stand,5000,\n'
+        '"Lamp, desk",1200,"two\nlines"\n'
+        ',,\n'
+        'Mug,300,"say ""hi"""'
+    ).encode()
+    rows = await _collect(iter_csv_rows(_chunks(body, size)))
+    assert rows == [
+        {"title": '32" TV stand', "price": "5000"},
+        {"title": "Lamp, desk", "price": "1200", "description": "two\nlines"},
+        {"title": "Mug", "price": "300", "description": 'say "hi"'},
+    ]
+
+
+async def test_csv_with_crlf_and_bom():
+    body = "﻿title,price\r\nKettle,2500\r\n".encode()
+    assert await _collect(iter_csv_rows(_chunks(body, 4))) == [{"title": "Kettle", "price": "2500"}]
+
+
+@pytest.mark.parametrize("size", [1, 5, 1000])
+async def test_json_rows_across_chunks(size):
+    body = b'[{"title": "Lamp", "price": 1200}, 12.5 , [1, 2], "x"]'
+    rows = await _collect(iter_json_rows(_chunks(body, size)))
+    assert rows == [{"title": "Lamp", "price": 1200}, 12.5, [1, 2], "x"]
+
+
+@pytest.mark.parametrize("body", [b"[1,]", b"[1, ]", b'[{"a": 1},\n]', b"[1 2]", b"[1", b"{}", b"[] x"])
+async def test_invalid_json_array(body):
+    with pytest.raises(HTTPException) as failure:
+        await _collect(iter_json_rows(_chunks(body, 2)))
+    assert failure.value.status_code == 400
+
+
+async def test_empty_json_array():
+    assert await _collect(iter_json_rows(_chunks(b" [ ] ", 2))) == []
+
+
+@pytest.mark.parametrize("parse", [iter_json_rows, iter_csv_rows])
+async def test_row_longer_than_the_cap_is_rejected(monkeypatch, parse):
+    monkeypatch.setattr(settings, "ITEM_IMPORT_MAX_ROW_CHARS", 100)
+    # An element or quoted field that never closes
+    body = (b'[{"title": "' if parse is iter_json_rows else b'title\n"') + b"x" * 1000
+    with pytest.raises(HTTPException) as failure:
+        await _collect(parse(_chunks(body, 10)))
+    assert failure.value.status_code == 413
+
+
+async def test_rows_under_the_cap_stream_past_it(monkeypatch):
+    monkeypatch.setattr(settings, "ITEM_IMPORT_MAX_ROW_CHARS", 100)
+    body = b"[" + b",".join(b'{"title": "Gift %d"}' % n for n in range(100)) + b"]"
+    assert len(await _collect(iter_json_rows(_chunks(body, 64)))) == 100
+
+
+@pytest.mark.parametrize("parse", [iter_json_rows, iter_csv_rows])
+async def test_body_larger_than_the_cap_is_rejected(monkeypatch, parse):
+    monkeypatch.setattr(settings, "ITEM_IMPORT_MAX_BYTES", 1000)
+    if parse is iter_json_rows:
+        body = b"[" + b",".join(b"1" for _ in range(1000)) + b"]"
+    else:
+        body = b"title\n" + b"x\n" * 1000
+    with pytest.raises(HTTPException) as failure:
+        await _collect(parse(_chunks(body, 64)))
+    assert failure.value.status_code == 413
+
+
+async def test_import_appends_after_existing_items(db, make_wishlist):
+    owner_id, wishlist_id, _, _ = await make_wishlist({"title": "Existing", "position": 5000})
+    rows = iter_json_rows(_chunks(b'[{"title": "A", "price": 1}, {"price": 1}, {"title": "B", "price": 2}]', 16))
+    result = await item_service.import_items(db, wishlist_id, owner_id, rows)
+    assert result.created == 2
+    assert [error.row for error in result.errors] == [2]
+
+    positions = await db.execute(
+        select(Item.title, Item.position).where(Item.wishlist_id == wishlist_id).order_by(Item.position)
+    )
+    gap = settings.ITEM_POSITION_GAP
+    assert positions.all() == [("Existing", 5000), ("A", 5000 + gap), ("B", 5000 + 2 * gap)]
@@ -0,0 +1,45 @@
+"""Reordering a wishlist takes the complete list of its items."""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.item import Item
+from app.services import item_service
+
+
+@pytest.fixture
+async def wishlist_items(make_wishlist):
+    """Three live items and a deleted one that a reorder must not list."""
+    seeded = await make_wishlist(*({"position": n} for n in range(3)), {"is_deleted": True})
+    return seeded.owner_id, seeded.wishlist_id, seeded.item_ids[:3]
+
+
+async def test_reorder_writes_spaced_positions(db, wishlist_items):
+    owner_id, wishlist_id, item_ids = wishlist_items
+    order = item_ids[::-1]
+    await item_service.reorder_items(db, wishlist_id, owner_id, order)
+
+    result = await db.execute(
+        select(Item.id, Item.position).where(Item.id.in_(item_ids)).order_by(Item.position)
+    )
+    gap = settings.ITEM_POSITION_GAP
+    assert result.all() == [(item_id, n * gap) for n, item_id in enumerate(order)]
+
+
+@pytest.mark.parametrize(
+    "pick",
+    [
+        lambda ids: ids[:2],
+        lambda ids: [*ids, uuid.uuid4()],
+        lambda ids: [ids[0], ids[1], ids[1]],
+    ],
+    ids=["missing item", "foreign item", "duplicate"],
+)
+async def test_reorder_rejects_anything_but_the_full_list(db, wishlist_items, pick):
+    owner_id, wishlist_id, item_ids = wishlist_items
+    with pytest.raises(HTTPException) as failure:
+        await item_service.reorder_items(db, wishlist_id, owner_id, pick(item_ids))
+    assert failure.value.status_code == 400
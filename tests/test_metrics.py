@@ -0,0 +1,13 @@
+"""Gauges read from process state at scrape time."""
+from prometheus_client import REGISTRY
+
+import app.core.metrics  # noqa: F401  registers the runtime collector
+from app.core import security
+from app.core.config import settings
+
+
+def test_password_hashing_gauges(monkeypatch):
+    monkeypatch.setattr(security, "_password_tasks_in_flight", settings.PASSWORD_HASH_WORKERS + 3)
+    assert REGISTRY.get_sample_value("password_hash_in_flight") == settings.PASSWORD_HASH_WORKERS + 3
+    assert REGISTRY.get_sample_value("password_hash_queue_depth") == 3
+    assert REGISTRY.get_sample_value("password_hash_workers") == settings.PASSWORD_HASH_WORKERS
@@ -0,0 +1,44 @@
+"""Public wishlist cache fills racing invalidations."""
+import time
+
+from app.core import cache
+from app.core.cache import (
+    CacheFill,
+    CachedResponse,
+    invalidate_public_wishlist,
+    public_wishlist_cache,
+    start_public_wishlist_fill,
+    store_public_wishlist,
+)
+from app.core.config import settings
+
+_BODY = CachedResponse(b"{}", '"etag"')
+
+
+def test_fill_is_cached():
+    fill = start_public_wishlist_fill()
+    assert store_public_wishlist("cache-fill", fill, _BODY)
+    assert public_wishlist_cache.get("cache-fill") == {"application/json": _BODY}
+
+
+def test_fill_raced_by_an_invalidation_is_not_cached():
+    fill = start_public_wishlist_fill()
+    invalidate_public_wishlist("cache-race", broadcast=False)
+    # Invalidations of other slugs must not push this one out while the fill is in flight
+    for n in range(settings.READ_YOUR_WRITES_CACHE_SIZE + 1):
+        invalidate_public_wishlist(f"cache-other-{n}", broadcast=False)
+    assert not store_public_wishlist("cache-race", fill, _BODY)
+    assert public_wishlist_cache.get("cache-race") is None
+
+
+def test_fill_slower_than_the_timeout_is_not_cached():
+    fill = CacheFill(cache._invalidation_sequence, time.monotonic() - cache._FILL_TIMEOUT_SECONDS)
+    assert not store_public_wishlist("cache-slow", fill, _BODY)
+
+
+def test_invalidation_is_broadcast_unless_it_came_from_another_worker(monkeypatch):
+    sent = []
+    monkeypatch.setattr(cache, "invalidation_listeners", [sent.append])
+    invalidate_public_wishlist("cache-local")
+    invalidate_public_wishlist("cache-remote", broadcast=False)
+    assert sent == ["cache-local"]
@@ -0,0 +1,68 @@
+"""SQL statements per endpoint: a per-item query shows up as a blown budget, not a slow page.
+
+Requests go through app.main:app in-process, so the middlewares and dependencies count too.
+"""
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from app.core.cache import public_wishlist_cache
+from app.core.security import create_access_token
+from app.main import app
+from app.schemas.reservation import ReservationCreate
+from app.services import reservation_service
+
+_ITEMS = 20
+
+# (method, path, json body, authenticated, max statements); paths are formatted with the
+# fixture ids, and the wishlist holds more items than any budget allows statements
+_BUDGETS = {
+    "me": ("GET", "/api/auth/me", None, True, 1),
+    "dashboard": ("GET", "/api/wishlists", None, True, 1),
+    "owner wishlist": ("GET", "/api/wishlists/{wishlist_id}", None, True, 2),
+    "public wishlist": ("GET", "/api/w/{slug}", None, False, 2),
+    "public wishlist page": ("GET", "/api/w/{slug}?limit=5", None, False, 2),
+    "reservations": ("GET", "/api/items/{reserved_id}/reservations", None, True, 3),
+    "create item": ("POST", "/api/wishlists/{wishlist_id}/items", {"title": "New", "price": 500}, True, 3),
+    "update item": ("PUT", "/api/items/{item_id}", {"title": "Renamed"}, True, 3),
+    "move item": ("PUT", "/api/items/{item_id}/position", {"after_id": None}, True, 4),
+    "reserve": ("POST", "/api/items/{item_id}/reserve", {"amount": 100, "guest_name": "Guest"}, False, 1),
+    "delete reserved item": ("DELETE", "/api/items/{reserved_id}", None, True, 3),
+    "delete item": ("DELETE", "/api/items/{item_id}", None, True, 2),
+}
+
+
+@pytest.fixture
+async def fixtures(db, make_wishlist) -> tuple[dict, dict]:
+    """(auth headers, path ids): a wishlist of _ITEMS items, the first few with reservations."""
+    seeded = await make_wishlist(
+        *({"title": f"Gift {n}", "price": Decimal("10000"), "position": n} for n in range(_ITEMS))
+    )
+    for item_id in seeded.item_ids[:3]:
+        for guest in range(3):
+            await reservation_service.create_reservation(
+                db, item_id, ReservationCreate(amount=100, guest_name=f"Guest {guest}")
+            )
+    auth = {"Authorization": f"Bearer {create_access_token(str(seeded.owner_id))}"}
+    ids = {
+        "wishlist_id": seeded.wishlist_id,
+        "slug": seeded.slug,
+        "reserved_id": seeded.item_ids[0],
+        "item_id": seeded.item_ids[-1],
+    }
+    return auth, ids
+
+
+@pytest.mark.parametrize("name", _BUDGETS)
+async def test_endpoint_query_budget(name, fixtures, query_budget):
+    method, path, body, authenticated, budget = _BUDGETS[name]
+    auth, ids = fixtures
+    public_wishlist_cache.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+        with query_budget(budget, name):
+            response = await client.request(
+                method, path.format(**ids), json=body, headers=auth if authenticated else {}
+            )
+    assert response.status_code < 400, response.text
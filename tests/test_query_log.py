@@ -0,0 +1,62 @@
+"""Per-request SQL statement counting, query budgets and the N+1 warning."""
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app.core.metrics import MetricsMiddleware, count_queries
+from app.db.query_log import fingerprint
+
+
+def test_fingerprint_folds_parameters_literals_and_lists():
+    assert fingerprint("SELECT * FROM items WHERE id IN ($1, $2::UUID) AND price > 10") == (
+        "SELECT * FROM items WHERE id IN (?, ...) AND price > ?"
+    )
+    assert fingerprint("SELECT 'a''b'::TEXT") == "SELECT ?::TEXT"
+
+
+async def test_budget_passes_within_limit(db, query_budget):
+    with query_budget(2) as stats:
+        await db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 2"))
+    assert stats.count == 2
+
+
+async def test_budget_fails_over_limit_with_the_statements(db, query_budget):
+    with pytest.raises(AssertionError, match=r"ran 2 statements, expected at most 1") as failure:
+        with query_budget(1):
+            await db.execute(text("SELECT 1"))
+            await db.execute(text("SELECT 2"))
+    assert "SELECT ?" in str(failure.value)
+
+
+async def test_nested_counts_reach_the_enclosing_block(db):
+    with count_queries(keep_statements=True) as outer:
+        await db.execute(text("SELECT 1"))
+        with count_queries() as inner:
+            await db.execute(text("SELECT 2"))
+    assert inner.count == 1
+    assert outer.count == 2
+    assert outer.statements == ["SELECT 1", "SELECT 2"]
+
+
+async def test_middleware_reports_count_and_warns_about_repeats(db, monkeypatch, caplog):
+    monkeypatch.setattr("app.core.metrics.settings.QUERY_LOG_ENABLED", True)
+
+    async def endpoint(scope, receive, send):
+        for n in range(3):
+            await db.execute(text("SELECT CAST(:n AS INTEGER)"), {"n": n})
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/n-plus-one"}
+    with caplog.at_level(logging.WARNING, logger="app.db.query_log"):
+        await MetricsMiddleware(endpoint)(scope, None, send)
+
+    assert (b"x-query-count", b"3") in messages[0]["headers"]
+    assert "Probable N+1 in GET unmatched: 3 x SELECT CAST(? AS INTEGER)" in caplog.text
@@ -0,0 +1,194 @@
+"""EXPLAIN each hot service query and check the index it reads through.
+
+Every case runs one service call while recording the SQL it sends, then plans each statement
+with its real parameters under `enable_seqscan = off`: a table with no usable index still gets
+a Seq Scan, so the test does not depend on how much data the database holds. Statistics are
+refreshed after seeding, and each read must use one of the indexes listed for it.
+"""
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, text
+
+from app.core.pagination import PageParams, encode_cursor
+from app.db.database import engine
+from app.models.user import User
+from app.schemas.item import ItemUpdate
+from app.schemas.reservation import ReservationBatchCreate, ReservationBatchLine, ReservationCreate
+from app.services import item_service, reservation_service, wishlist_service, wishlist_views
+
+_ITEMS = 30
+
+
+def _page(cursor: str | None = None) -> PageParams:
+    return PageParams(limit=20, cursor=cursor)
+
+
+@pytest.fixture
+async def seeded(db, make_wishlist) -> dict:
+    """Two wishlists with a few soft-deleted items; the first items hold guest and user reservations."""
+    other = await make_wishlist(*({"position": n * 1024} for n in range(_ITEMS)))
+    seeded = await make_wishlist(
+        *({"position": n * 1024, "is_deleted": n % 10 == 9, "price": Decimal("10000")} for n in range(_ITEMS))
+    )
+    guest = await db.get(User, other.owner_id)
+    for item_id in seeded.item_ids[:3]:
+        for n in range(3):
+            await reservation_service.create_reservation(
+                db, item_id, ReservationCreate(amount=100, guest_name=f"Guest {n}")
+            )
+            await reservation_service.create_reservation(
+                db, item_id, ReservationCreate(amount=100), user=guest
+            )
+    await db.execute(text("ANALYZE users, wishlists, items, reservations"))
+    await db.commit()
+    live = [item_id for n, item_id in enumerate(seeded.item_ids) if n % 10 != 9]
+    reservations, _ = await reservation_service.get_item_reservations(db, live[0], None, _page())
+    return {
+        "user_id": seeded.owner_id,
+        "guest_id": other.owner_id,
+        "wishlist_id": seeded.wishlist_id,
+        "slug": seeded.slug,
+        "item_id": live[0],
+        "last_item_id": live[-1],
+        "live_ids": live,
+        "item_cursor": encode_cursor(0, live[0]),
+        "reservation_cursor": encode_cursor(reservations[0].created_at, reservations[0].id),
+    }
+
+
+async def _stream(db, wishlist_id) -> None:
+    async for _ in wishlist_views.stream_items(db, wishlist_id):
+        pass
+
+
+def _batch(f) -> ReservationBatchCreate:
+    lines = [ReservationBatchLine(item_id=item_id, amount=100) for item_id in f["live_ids"][3:6]]
+    return ReservationBatchCreate(items=lines, guest_name="Guest")
+
+
+_OWNED_WISHLIST = {"wishlists_pkey", "ix_wishlists_user_id_created_at_id"}
+
+# name -> (coroutine factory (db, fixtures), index reads); every read must go through one of the
+# indexes of its set, and no other index may show up. Ordered item and reservation lists are
+# pinned to their keyset index: any other one needs a sort.
+_CASES = {
+    "dashboard": (
+        lambda db, f: wishlist_service.get_user_wishlists(db, f["user_id"]),
+        [{"ix_wishlists_user_id_created_at_id"}, {"ix_items_wishlist_id_position_id"}],
+    ),
+    "dashboard page": (
+        lambda db, f: wishlist_service.get_user_wishlists(db, f["user_id"], _page()),
+        [{"ix_wishlists_user_id_created_at_id"}, {"ix_items_wishlist_id_position_id"}],
+    ),
+    "public wishlist": (
+        lambda db, f: wishlist_views.get_public_wishlist(db, f["slug"]),
+        [{"ix_wishlists_slug"}],
+    ),
+    "owner wishlist": (
+        lambda db, f: wishlist_views.get_owner_wishlist(db, f["wishlist_id"], f["user_id"]),
+        [_OWNED_WISHLIST],
+    ),
+    "items": (
+        lambda db, f: wishlist_views.get_items(db, f["wishlist_id"]),
+        [{"ix_items_wishlist_id_position_id"}],
+    ),
+    "items page": (
+        lambda db, f: wishlist_views.get_items(db, f["wishlist_id"], _page(f["item_cursor"])),
+        [{"ix_items_wishlist_id_position_id"}],
+    ),
+    "items stream": (
+        lambda db, f: _stream(db, f["wishlist_id"]),
+        [{"ix_items_wishlist_id_position_id"}],
+    ),
+    "reservations": (
+        lambda db, f: reservation_service.get_item_reservations(db, f["item_id"]),
+        [{"items_pkey"}, {"wishlists_pkey"}, {"ix_reservations_item_id_created_at_id"}],
+    ),
+    "reservations page": (
+        lambda db, f: reservation_service.get_item_reservations(
+            db, f["item_id"], None, _page(f["reservation_cursor"])
+        ),
+        [{"items_pkey"}, {"wishlists_pkey"}, {"ix_reservations_item_id_created_at_id"}],
+    ),
+    # Write paths: the reserve CTE, the ownership check, the reorder UPDATE ... FROM (VALUES ...)
+    # and the batch's FOR UPDATE select
+    "reserve": (
+        lambda db, f: reservation_service.create_reservation(
+            db, f["last_item_id"], ReservationCreate(amount=100, guest_name="Guest")
+        ),
+        [{"items_pkey"}, {"wishlists_pkey"}],
+    ),
+    "update item": (
+        lambda db, f: item_service.update_item(db, f["item_id"], f["user_id"], ItemUpdate(title="Renamed")),
+        [{"items_pkey"}, _OWNED_WISHLIST],
+    ),
+    "reorder": (
+        lambda db, f: item_service.reorder_items(
+            db, f["wishlist_id"], f["user_id"], list(reversed(f["live_ids"]))
+        ),
+        [_OWNED_WISHLIST, {"ix_items_wishlist_id_position_id", "ix_items_wishlist_id", "items_pkey"}],
+    ),
+    "reserve batch": (
+        lambda db, f: reservation_service.create_reservations_batch(db, f["slug"], _batch(f)),
+        [{"ix_wishlists_slug"}, {"items_pkey", "ix_items_wishlist_id_position_id"}],
+    ),
+    # What Postgres runs for the foreign keys when users/wishlists/items are deleted
+    "fk: user deleted": (
+        lambda db, f: db.execute(
+            text("UPDATE reservations SET user_id = NULL WHERE user_id = :id"), {"id": f["guest_id"]}
+        ),
+        [{"ix_reservations_user_id"}],
+    ),
+    "fk: wishlist deleted": (
+        lambda db, f: db.execute(
+            text("DELETE FROM items WHERE wishlist_id = :id"), {"id": f["wishlist_id"]}
+        ),
+        [{"ix_items_wishlist_id"}],
+    ),
+    "fk: item deleted": (
+        lambda db, f: db.execute(
+            text("DELETE FROM reservations WHERE item_id = :id"), {"id": f["item_id"]}
+        ),
+        [{"ix_reservations_item_id_created_at_id"}],
+    ),
+}
+
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _walk(child)
+
+
+@pytest.mark.parametrize("name", _CASES)
+async def test_query_plan_uses_expected_indexes(name, db, seeded):
+    case, reads = _CASES[name]
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            recorded.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        await case(db, seeded)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    # EXPLAIN without ANALYZE plans the writes without running them again
+    await db.rollback()
+    conn = await db.connection()
+    await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    scans, indexes = [], set()
+    for statement, parameters in recorded:
+        result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        for node in _walk(result.scalar()[0]["Plan"]):  # asyncpg decodes the json column
+            if node["Node Type"] == "Seq Scan":
+                scans.append(node["Relation Name"])
+            if "Index Name" in node:
+                indexes.add(node["Index Name"])
+    await db.rollback()
+    assert recorded
+    assert not scans, f"{name}: seq scan on {', '.join(scans)}"
+    assert indexes <= set().union(*reads), f"{name}: unexpected {', '.join(indexes - set().union(*reads))}"
+    assert all(indexes & read for read in reads), f"{name}: read through {', '.join(sorted(indexes))}"
@@ -0,0 +1,152 @@
+"""Socket.IO fan-out between worker processes through an in-memory broker."""
+import asyncio
+
+import pytest
+import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
+from socketio.packet import Packet
+
+from app.core import websocket
+from app.core.cache import CachedResponse, public_wishlist_cache
+from app.core.config import settings
+from app.core.websocket import EventDispatcher
+
+
+class FakeBroker:
+    """Delivers every published message to every subscriber, like a pub/sub channel."""
+
+    def __init__(self):
+        self.subscribers: list[asyncio.Queue] = []
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self.subscribers.append(queue)
+        return queue
+
+    async def publish(self, message) -> None:
+        for queue in self.subscribers:
+            await queue.put(message)
+
+
+class FakeBrokerManager(websocket._CacheInvalidationMixin, AsyncPubSubManager):
+    name = "fake"
+
+    def __init__(self, broker: FakeBroker):
+        super().__init__(channel="wishlist-test")
+        self.broker = broker
+        self.queue = broker.subscribe()
+
+    async def _publish(self, data):
+        await self.broker.publish(data)
+
+    async def _listen(self):
+        while True:
+            yield await self.queue.get()
+
+
+@pytest.fixture
+async def workers():
+    """Two servers sharing a broker, as two uvicorn workers would."""
+    broker = FakeBroker()
+    servers = []
+    for _ in range(2):
+        server = socketio.AsyncServer(async_mode="asgi", client_manager=FakeBrokerManager(broker))
+        server.manager.initialize()
+        servers.append(server)
+    yield servers
+    for server in servers:
+        server.manager.thread.cancel()
+
+
+async def _connect_client(server: socketio.AsyncServer, room: str) -> list:
+    """A client of server in room; returns the event payloads the server sends it."""
+    sent = []
+
+    async def capture(eio_sid, eio_packet):
+        sent.append(Packet(encoded_packet=eio_packet.data).data)
+
+    server._send_eio_packet = capture
+    sid = await server.manager.connect("eio-client", "/")
+    await server.enter_room(sid, room)
+    return sent
+
+
+async def _wait_for(packets: list, timeout: float = 1.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not packets:
+            await asyncio.sleep(0.01)
+
+
+async def test_event_reaches_client_of_another_worker(workers):
+    publisher, receiver = workers
+    packets = await _connect_client(receiver, "wishlist:fan-out")
+
+    dispatcher = EventDispatcher(publisher, window=0.01, max_queue=10)
+    dispatcher.publish("wishlist:fan-out", "item:reserved", {"item_id": "1", "amount": 100})
+    await dispatcher.drain()
+    await _wait_for(packets)
+
+    assert len(packets) == 1
+    assert packets[0] == ["item:reserved", {"item_id": "1", "amount": 100}]
+    assert dispatcher.stats()["emitted"] == 1
+
+
+async def test_coalesced_burst_crosses_workers_as_one_batch(workers):
+    publisher, receiver = workers
+    packets = await _connect_client(receiver, "wishlist:burst")
+
+    dispatcher = EventDispatcher(publisher, window=0.05, max_queue=10)
+    for n in range(3):
+        dispatcher.publish("wishlist:burst", "item:reserved", {"n": n})
+    await dispatcher.drain()
+    await _wait_for(packets)
+
+    assert len(packets) == 1
+    event, payload = packets[0]
+    assert event == "wishlist:batch"
+    assert [entry["data"]["n"] for entry in payload["events"]] == [0, 1, 2]
+
+
+async def test_other_rooms_receive_nothing(workers):
+    publisher, receiver = workers
+    packets = await _connect_client(receiver, "wishlist:elsewhere")
+
+    dispatcher = EventDispatcher(publisher, window=0.01, max_queue=10)
+    dispatcher.publish("wishlist:fan-out", "item:reserved", {"item_id": "1"})
+    await dispatcher.drain()
+    await asyncio.sleep(0.1)
+
+    assert packets == []
+
+
+async def test_cache_invalidation_reaches_another_worker(workers):
+    publisher, _ = workers
+    public_wishlist_cache.set("fan-out", {"application/json": CachedResponse(b"{}", '"etag"')})
+
+    # Only the other worker applies it: the publisher invalidates its own cache before broadcasting
+    dispatcher = EventDispatcher(publisher, window=0.01, max_queue=10)
+    dispatcher.broadcast(websocket.PUBLIC_WISHLIST_INVALIDATED, "fan-out")
+    await dispatcher.drain()
+    async with asyncio.timeout(1.0):
+        while public_wishlist_cache.get("fan-out") is not None:
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize(
+    ("backend", "expected"),
+    [
+        ("memory", type(None)),
+        ("redis", socketio.AsyncRedisManager),
+        ("AMQP", socketio.AsyncAioPikaManager),
+    ],
+)
+def test_client_manager_selection(monkeypatch, backend, expected):
+    monkeypatch.setattr(settings, "SOCKETIO_MANAGER", backend)
+    monkeypatch.setattr(settings, "SOCKETIO_MESSAGE_QUEUE_URL", "redis://localhost:6379/0")
+    assert isinstance(websocket._create_client_manager(), expected)
+
+
+def test_unknown_client_manager_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "SOCKETIO_MANAGER", "kafka")
+    with pytest.raises(ValueError, match="kafka"):
+        websocket._create_client_manager()
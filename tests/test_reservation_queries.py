@@ -0,0 +1,70 @@
+"""Reservation mutations: one read and one write each, with the realtime event context."""
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.reservation import ReservationCreate, ReservationUpdate
+from app.services import reservation_service
+
+
+@pytest.fixture
+async def item(make_wishlist):
+    """Id of an item of 10 000 in someone else's public wishlist."""
+    seeded = await make_wishlist({"price": Decimal("10000")})
+    return seeded.item_ids[0]
+
+
+async def test_create_reservation_is_one_statement(db, item, query_budget):
+    with query_budget(1):
+        result = await reservation_service.create_reservation(
+            db, item, ReservationCreate(amount=500, guest_name="Guest")
+        )
+    assert result.item_id == item
+    assert result.wishlist_slug.startswith("test-")
+    assert result.reserved_amount == Decimal("500")
+    assert result.reservation_count == 1
+
+
+async def test_update_reservation_is_one_read_and_one_write(db, item, query_budget):
+    created = await reservation_service.create_reservation(
+        db, item, ReservationCreate(amount=500, guest_name="Guest")
+    )
+    with query_budget(2):
+        result = await reservation_service.update_reservation(
+            db, created.reservation.id, ReservationUpdate(amount=800)
+        )
+    assert result.reservation.amount == Decimal("800")
+    assert result.reserved_amount == Decimal("800")
+    assert result.wishlist_slug == created.wishlist_slug
+
+
+async def test_noop_update_only_reads(db, item, query_budget):
+    created = await reservation_service.create_reservation(
+        db, item, ReservationCreate(amount=500, guest_name="Guest")
+    )
+    with query_budget(1):
+        result = await reservation_service.update_reservation(
+            db, created.reservation.id, ReservationUpdate()
+        )
+    assert result.reserved_amount == Decimal("500")
+
+
+async def test_delete_reservation_is_one_read_and_one_write(db, item, query_budget):
+    created = await reservation_service.create_reservation(
+        db, item, ReservationCreate(amount=500, guest_name="Guest")
+    )
+    await reservation_service.create_reservation(
+        db, item, ReservationCreate(amount=300, guest_name="Other guest")
+    )
+    with query_budget(2):
+        result = await reservation_service.delete_reservation(db, created.reservation.id)
+    assert result.reserved_amount == Decimal("300")
+    assert result.reservation_count == 1
+    assert result.wishlist_slug == created.wishlist_slug
+
+
+async def test_guest_without_name_is_rejected_before_any_statement(db, item, query_budget):
+    with query_budget(0), pytest.raises(HTTPException) as failure:
+        await reservation_service.create_reservation(db, item, ReservationCreate(amount=500))
+    assert failure.value.status_code == 400